@@ -1,6 +1,7 @@
 """Configuration management"""
 
 import os
+from typing import Optional
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -13,13 +14,84 @@ class Settings(BaseSettings):
     cerebras_api_key: str = Field(..., env="CEREBRAS_API_KEY")
     cerebras_base_url: str = Field(default="https://api.cerebras.ai/v1")
     cerebras_model: str = Field(default="llama3.1-8b")
+    # Prompt input budgets in tokens (app/services/prompt_budget.py picks
+    # the most relevant CV sections / description sentences that fit)
+    cv_prompt_tokens: int = Field(default=1000)  # LLM-only CV parse
+    cv_gap_prompt_tokens: int = Field(default=625)  # when rules filled most fields
+    query_experience_tokens: int = Field(default=80)
+    cover_letter_jd_tokens: int = Field(default=250)
+    cover_letter_skills_tokens: int = Field(default=60)
+    cover_letter_experience_tokens: int = Field(default=150)
     
     # Tavily
     tavily_api_key: str = Field(..., env="TAVILY_API_KEY")
+    tavily_base_url: Optional[str] = Field(default=None)
+    tavily_timeout: float = Field(default=45.0)
+    tavily_breaker_failures: int = Field(default=3)
+    tavily_breaker_reset_seconds: float = Field(default=30.0)
+    # Adaptive depth: "basic" first, "advanced" only if fewer than
+    # tavily_min_yield results survive the filters
+    tavily_adaptive: bool = Field(default=True)
+    tavily_basic_results: int = Field(default=20)
+    tavily_min_yield: int = Field(default=8)
+    
+    # Resume-mode search: also search with the skills-based query while the
+    # LLM query is generated, and wait this long for the LLM-query results
+    speculative_search: bool = Field(default=True)
+    speculative_deadline_seconds: float = Field(default=8.0)
     
     # Supabase
     supabase_url: str = Field(..., env="SUPABASE_URL")
     supabase_key: str = Field(..., env="SUPABASE_KEY")
+    # Hot queries over a pooled async PostgREST client instead of supabase-py in threads
+    postgrest_async: bool = Field(default=False)
+    postgrest_pool_size: int = Field(default=20)
+    postgrest_timeout: float = Field(default=10.0)
+    
+    # Background profile refresh (0 disables)
+    refresh_interval_minutes: int = Field(default=360)
+    # Resume-mode /search searches live instead of serving a saved set older than this
+    saved_results_max_age_minutes: int = Field(default=1440)
+    refresh_concurrency: int = Field(default=3)
+    # Lock files also record the last pass, so keep them somewhere that survives restarts
+    refresh_lock_file: str = Field(default="data/locks/refresh.lock")
+    # Post-onboarding prefetch (0 disables)
+    prefetch_concurrency: int = Field(default=2)
+    prefetch_max_pending: int = Field(default=50)
+    
+    # Near-duplicate postings (estimated Jaccard over title/company/description)
+    dedup_threshold: float = Field(default=0.6)
+    # Each worker keeps its own index: capped at this many postings (newest
+    # kept), and topped up with other workers' inserts every N seconds
+    # (0 disables; a duplicate stored elsewhere inside that window is missed)
+    dedup_max_jobs: int = Field(default=20000)
+    dedup_refresh_seconds: float = Field(default=30.0)
+    
+    # Batch cover letters
+    cover_letter_concurrency: int = Field(default=4)
+    cover_letter_batch_max: int = Field(default=25)
+    
+    # Local embedding index for "jobs like my CV"
+    embedding_dir: str = Field(default="data/embeddings")
+    embedding_dim: int = Field(default=512)
+    embedding_exact_below: int = Field(default=20000)  # brute force under this many rows
+    
+    # Retention (0 days disables the scheduled job)
+    retention_days: int = Field(default=30)
+    retention_interval_minutes: int = Field(default=1440)
+    retention_batch_size: int = Field(default=500)
+    retention_archive_dir: str = Field(default="data/archive")
+    retention_lock_file: str = Field(default="data/locks/retention.lock")
+    
+    # Lazy job detail hydration (GET /jobs/{id}/detail)
+    detail_cache_entries: int = Field(default=500)
+    detail_cache_bytes: int = Field(default=20 * 1024 * 1024)
+    detail_ttl_seconds: float = Field(default=86400.0)
+    detail_max_bytes: int = Field(default=2 * 1024 * 1024)  # download cap per page
+    detail_timeout: float = Field(default=10.0)
+    
+    # Responses at least this big are sent brotli/gzip compressed
+    compress_min_bytes: int = Field(default=1024)
     
     # App
     debug: bool = Field(default=False)
@@ -1,11 +1,20 @@
 """FastAPI Application - SDR Job Agent"""
 
+import os
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.routers import search, jobs, onboard, generator
+from app.services.profile_refresher import profile_refresher
+from app.services.retention import job_retention
+from app.services.supabase_service import supabase_service
+from app.services.embedding_index import embedding_index
+from app.services.tavily_client import tavily_client
+from app.services.cerebras_client import cerebras_client
+from app.services.job_detail import job_detail
 
 # Setup logging
 logging.basicConfig(
@@ -22,9 +31,25 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 50)
     logger.info("SDR Job Agent Starting...")
     logger.info(f"[INFO] Database: {settings.supabase_url}")
+    logger.info(f"[INFO] Worker PID: {os.getpid()}")
     logger.info("=" * 50)
+    # Stored / deleted jobs go straight into / out of the embedding index (if numpy is installed)
+    if embedding_index.available:
+        supabase_service.add_insert_listener(embedding_index.add_jobs)
+        supabase_service.add_delete_listener(embedding_index.remove_jobs)
+    # Per-worker warm state, built in the background so startup isn't blocked;
+    # the dedup index then polls for jobs other workers stored
+    sync_dedup = asyncio.create_task(supabase_service.sync_dedup_index(settings.dedup_refresh_seconds))
+    profile_refresher.start()
+    job_retention.start()
     yield
     logger.info("Shutting down...")
+    sync_dedup.cancel()
+    await profile_refresher.stop()
+    await job_retention.stop()
+    if supabase_service.rest:
+        await supabase_service.rest.aclose()
+    await job_detail.aclose()
 
 
 # Create app
@@ -71,10 +96,12 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health():
-    """Health check"""
-    return {"status": "healthy"}
+    """Health check (plus search yield and LLM token telemetry)"""
+    return {"status": "healthy", "tavily": tavily_client.telemetry(), "llm": cerebras_client.usage_summary()}
 
 
 if __name__ == "__main__":
+    # Development server. For production use gunicorn with preloaded,
+    # forked workers: gunicorn app.main:app -c gunicorn.conf.py
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Pydantic models for request/response"""
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from enum import Enum
@@ -24,13 +24,15 @@ class ProfileResponse(BaseModel):
 
 # Job Models
 class JobResponse(BaseModel):
-    id: str
+    """Single job shape for /search and /jobs (id is None for unsaved results)"""
+    id: Optional[str] = None
     title: str
     company: Optional[str] = None
     url: str
     description: Optional[str] = None
     location: Optional[str] = None
     source: str = "tavily"
+    alternate_urls: List[str] = []
     created_at: Optional[datetime] = None
 
 
@@ -40,11 +42,15 @@ class SearchRequest(BaseModel):
 
 
 class SearchResponse(BaseModel):
-    success: bool
-    query_used: str
-    jobs_found: int
+    success: bool = True
+    query: str
+    count: int
     jobs: List[JobResponse] = []
-    message: str
+    cached: bool = False
+    degraded: bool = False  # live search unavailable, served from stored jobs
+    since: Optional[str] = None  # only_new/since mode: postings first seen after this
+    latency_ms: Optional[float] = None
+    timings_ms: Dict[str, float] = {}
 
 
 # Onboarding Models
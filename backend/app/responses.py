@@ -0,0 +1,129 @@
+"""Fast response encoding for trusted job payloads"""
+
+import gzip
+import json
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi import Request
+from fastapi.responses import Response
+from app.models import JobResponse
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip is always available
+    brotli = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+JOB_FIELDS = tuple(JobResponse.model_fields)
+_JOB_DEFAULTS = {
+    name: field.get_default(call_default_factory=True)
+    for name, field in JobResponse.model_fields.items()
+    if not field.is_required()
+}
+
+
+def job_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Project a job dict onto the JobResponse fields without validation.
+
+    Jobs come from our own Tavily parsing or the jobs table, so they are
+    already trusted; this only drops extra keys and fills defaults.
+    """
+    out = {}
+    for name in JOB_FIELDS:
+        value = job.get(name)
+        if value is None:
+            value = _JOB_DEFAULTS.get(name)
+            if isinstance(value, list):
+                value = []
+        out[name] = value
+    return out
+
+
+def job_payloads(jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [job_payload(job) for job in jobs]
+
+
+def _default(value: Any) -> Any:
+    # datetimes and anything else non-native
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def wants_msgpack(request: Optional[Request]) -> bool:
+    if msgpack is None or request is None:
+        return False
+    return MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def accepted_encodings(request: Optional[Request]) -> List[str]:
+    """Codings from Accept-Encoding, skipping any sent with q=0"""
+    if request is None:
+        return []
+    codings = []
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            codings.append(name.strip().lower())
+    return codings
+
+
+def compress_body(body: bytes, request: Optional[Request]) -> Tuple[bytes, Optional[str]]:
+    """Brotli or gzip the body when it's big enough and the client accepts it"""
+    if len(body) < settings.compress_min_bytes:
+        return body, None
+    codings = accepted_encodings(request)
+    if brotli is not None and "br" in codings:
+        return brotli.compress(body, quality=4), "br"
+    if "gzip" in codings:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def make_etag(*parts: Any) -> str:
+    return 'W/"' + hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20] + '"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already names this ETag"""
+    sent = request.headers.get("if-none-match", "")
+    return sent.strip() == "*" or etag in (tag.strip() for tag in sent.split(","))
+
+
+def render(payload: Any, request: Optional[Request] = None, status_code: int = 200,
+           etag: Optional[str] = None) -> Response:
+    """Encode a payload as JSON, or msgpack when the client asks for it (compressed when large)"""
+    if wants_msgpack(request):
+        body, media_type = msgpack.packb(payload, default=_default, use_bin_type=True), MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = encode_json(payload), "application/json"
+    body, coding = compress_body(body, request)
+
+    vary = ["Accept"] if msgpack is not None else []
+    if len(body) >= settings.compress_min_bytes or coding:
+        vary.append("Accept-Encoding")
+    headers = {"Vary": ", ".join(vary)} if vary else {}
+    if coding:
+        headers["Content-Encoding"] = coding
+    if etag:
+        headers["ETag"] = etag
+    return Response(body, status_code=status_code, media_type=media_type, headers=headers or None)
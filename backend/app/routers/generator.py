@@ -1,13 +1,21 @@
+import asyncio
+import logging
 from fastapi import APIRouter, HTTPException, Body
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.config import settings
+from app.responses import encode_json
 from app.services.cerebras_client import cerebras_client
 from app.services.supabase_service import supabase_service
+from app.services.job_detail import job_detail
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/generate", tags=["Generator"])
 
 class CoverLetterRequest(BaseModel):
     email: str
+    job_id: Optional[str] = None  # uses the full posting if /jobs/{id}/detail was opened
     job_title: str = "Job Application"
     company: str = "Hiring Manager"
     description: str = ""
@@ -15,6 +23,16 @@ class CoverLetterRequest(BaseModel):
 class CoverLetterResponse(BaseModel):
     letter: str
 
+class BatchJob(BaseModel):
+    id: Optional[str] = None
+    job_title: str = "Job Application"
+    company: str = "Hiring Manager"
+    description: str = ""
+
+class BatchCoverLetterRequest(BaseModel):
+    email: str
+    jobs: List[BatchJob] = Field(..., min_length=1)
+
 @router.post("/cover-letter", response_model=CoverLetterResponse)
 async def generate_cover_letter(req: CoverLetterRequest):
     # 1. Fetch User Profile
@@ -29,7 +47,56 @@ async def generate_cover_letter(req: CoverLetterRequest):
         experience=profile.get("experience_summary", ""),
         job_title=req.job_title,
         company=req.company,
-        job_description=req.description
+        job_description=job_detail.cached_text(req.job_id) or req.description
     )
     
     return CoverLetterResponse(letter=letter)
+
+
+@router.post("/cover-letters")
+async def generate_cover_letters(req: BatchCoverLetterRequest):
+    """
+    Generate letters for many jobs in one call.
+    
+    Streams NDJSON, one line per job in completion order:
+    {"index", "id", "company", "letter"} or {"index", "id", "company", "error"}.
+    """
+    if len(req.jobs) > settings.cover_letter_batch_max:
+        raise HTTPException(status_code=413, detail=f"Too many jobs (max {settings.cover_letter_batch_max})")
+    
+    # Profile is loaded once for the whole batch
+    profile = await supabase_service.get_profile_by_email(req.email)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found. Please upload CV first.")
+    
+    semaphore = asyncio.Semaphore(max(1, settings.cover_letter_concurrency))
+    
+    async def _one(index: int, job: BatchJob) -> dict:
+        item = {"index": index, "id": job.id, "company": job.company}
+        async with semaphore:
+            try:
+                item["letter"] = await cerebras_client.generate_cover_letter(
+                    user_name=profile.get("full_name", "Applicant"),
+                    skills=profile.get("skills", []),
+                    experience=profile.get("experience_summary", ""),
+                    job_title=job.job_title,
+                    company=job.company,
+                    job_description=job_detail.cached_text(job.id) or job.description,
+                    strict=True
+                )
+            except Exception as e:
+                item["error"] = str(e) or type(e).__name__
+        return item
+    
+    async def _stream():
+        tasks = [asyncio.create_task(_one(i, job)) for i, job in enumerate(req.jobs)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield encode_json(await finished) + b"\n"
+        finally:
+            # Client went away: don't keep spending tokens
+            for task in tasks:
+                task.cancel()
+        logger.info(f"[SUCCESS] Batch of {len(tasks)} cover letters done")
+    
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
@@ -1,10 +1,17 @@
 """Jobs endpoint for retrieving saved jobs"""
 
+import asyncio
 import logging
-from fastapi import APIRouter, Query, HTTPException
-from typing import List
+from datetime import date
+from fastapi import APIRouter, Query, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
 from app.models import JobResponse
+from app.responses import render, job_payload, job_payloads, make_etag, not_modified, wants_msgpack
 from app.services.supabase_service import supabase_service
+from app.services.embedding_index import embedding_index
+from app.services.export import export_jobs
+from app.services.job_detail import job_detail
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -12,28 +19,122 @@ router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 @router.get("", response_model=List[JobResponse])
 async def get_jobs(
+    request: Request,
     limit: int = Query(default=100, ge=1, le=100, description="Number of jobs")
 ):
     """Get recently saved jobs from database"""
+    # Polls that have seen this version get a 304 before the heavy query
+    version = await supabase_service.get_jobs_version()
+    etag = make_etag(version, limit, wants_msgpack(request)) if version is not None else None
+    if etag and not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept, Accept-Encoding"})
+    
     logger.info(f"[INFO] Fetching {limit} recent jobs")
     
     try:
         jobs = await supabase_service.get_recent_jobs(limit)
         
-        return [
-            JobResponse(
-                id=job.get("id", ""),
-                title=job.get("title", "Untitled"),
-                company=job.get("company"),
-                url=job.get("url", ""),
-                description=job.get("description"),
-                location=job.get("location"),
-                source=job.get("source", "tavily"),
-                created_at=job.get("created_at")
-            )
-            for job in jobs
-        ]
+        return render(job_payloads(jobs), request, etag=etag)
         
     except Exception as e:
         logger.error(f"[ERROR] Failed to fetch jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def job_stats(
+    request: Request,
+    top: int = Query(default=10, ge=1, le=100, description="Entries per breakdown"),
+    days: int = Query(default=30, ge=1, le=365, description="Days in the daily series")
+):
+    """Counts by source, location, company and day, plus top search queries (from rollups)"""
+    try:
+        sources, locations, companies, daily, queries = await asyncio.gather(
+            supabase_service.get_rollup_top("source", 100),
+            supabase_service.get_rollup_top("location", top),
+            supabase_service.get_rollup_top("company", top),
+            supabase_service.get_rollup_top("day", days, by_key=True),
+            supabase_service.get_rollup_top("query", top),
+        )
+    except Exception as e:
+        logger.error(f"[ERROR] Failed to fetch job stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def _pairs(rows):
+        return [{"key": row["key"], "count": row["count"]} for row in rows]
+    
+    return render({
+        "total": sum(row["count"] for row in sources),
+        "by_source": _pairs(sources),
+        "by_location": _pairs(locations),
+        "by_company": _pairs(companies),
+        "by_day": _pairs(reversed(daily)),
+        "top_queries": _pairs(queries)
+    }, request)
+
+
+@router.get("/export")
+async def export_all_jobs(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    since: Optional[date] = Query(default=None, description="Created on or after (YYYY-MM-DD)"),
+    until: Optional[date] = Query(default=None, description="Created before (YYYY-MM-DD)"),
+    source: Optional[str] = Query(default=None, description="Only this source")
+):
+    """Stream the whole jobs table (filtered) as a gzipped NDJSON or CSV file"""
+    logger.info(f"[INFO] Exporting jobs as {format} (since={since}, until={until}, source={source})")
+    filename = f"jobs-{date.today():%Y%m%d}.{format}.gz"
+    return StreamingResponse(
+        export_jobs(
+            format,
+            since.isoformat() if since else None,
+            until.isoformat() if until else None,
+            source
+        ),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/similar")
+async def similar_jobs(
+    request: Request,
+    email: str = Query(..., description="Profile email"),
+    k: int = Query(default=20, ge=1, le=100, description="Number of jobs")
+):
+    """Stored jobs closest to the profile's CV in the local embedding index"""
+    if not embedding_index.available:
+        raise HTTPException(status_code=503, detail="Similar jobs need numpy on the server (pip install numpy)")
+    loop = asyncio.get_event_loop()
+    vec = await loop.run_in_executor(None, embedding_index.profile_vector, email)
+    if vec is None:
+        # Not embedded yet (onboarded before the index existed): do it now
+        profile = await supabase_service.get_profile_by_email(email)
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found. Please upload CV first.")
+        profile["cv_text"] = await supabase_service.get_cv_text(email)
+        vec = await loop.run_in_executor(None, embedding_index.add_profile, email, profile)
+    
+    matches = await loop.run_in_executor(None, embedding_index.similar_jobs, vec, k)
+    scores = dict(matches)
+    jobs = await supabase_service.get_jobs_by_ids([job_id for job_id, _ in matches])
+    
+    return render({
+        "email": email,
+        "count": len(jobs),
+        "jobs": [{**job_payload(job), "score": round(scores[job["id"]], 4)} for job in jobs]
+    }, request)
+
+
+async def _load_job(job_id: str):
+    jobs = await supabase_service.get_jobs_by_ids([job_id])
+    return jobs[0] if jobs else None
+
+
+# Declared last so /jobs/stats, /jobs/export and /jobs/similar match first
+@router.get("/{job_id}/detail")
+async def job_detail_view(request: Request, job_id: str):
+    """Full posting text, fetched from the job's URL on first open and cached"""
+    detail = await job_detail.get(job_id, _load_job)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return render(detail, request)
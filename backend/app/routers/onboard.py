@@ -1,48 +1,86 @@
 """Onboarding endpoint for CV upload"""
 
+import asyncio
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from app.models import OnboardingResponse, ProfileResponse
 from app.services.pdf_parser import PDFParser
+from app.services.upload import spool_pdf_request, UploadRejected
 from app.services.cerebras_client import cerebras_client
 from app.services.supabase_service import supabase_service
+from app.services.embedding_index import embedding_index
+from app.services.profile_refresher import profile_refresher
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/onboard", tags=["Onboarding"])
 
 
-@router.post("", response_model=OnboardingResponse)
-async def onboard_user(file: UploadFile = File(..., description="PDF Resume")):
+def _profile_response(profile: dict) -> ProfileResponse:
+    return ProfileResponse(
+        id=profile.get("id", ""),
+        full_name=profile.get("full_name", ""),
+        email=profile.get("email", ""),
+        skills=profile.get("skills", []),
+        location=profile.get("location", ""),
+        experience_summary=profile.get("experience_summary", "")
+    )
+
+
+# The body is read straight from the request stream (see spool_pdf_request),
+# so the multipart form is described here instead of with File(...)
+UPLOAD_BODY = {
+    "required": True,
+    "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["file"],
+        "properties": {"file": {"type": "string", "format": "binary", "description": "PDF Resume"}},
+    }}},
+}
+
+
+@router.post("", response_model=OnboardingResponse, openapi_extra={"requestBody": UPLOAD_BODY})
+async def onboard_user(
+    request: Request,
+    force_refresh: bool = Query(default=False, description="Reprocess even if this exact file was seen before")
+):
     """
     Upload CV/Resume to create profile.
     
+    0. Returns the existing profile if these exact bytes were processed before
     1. Extracts text from PDF
     2. AI parses name, email, skills
     3. Saves to database
     """
+    # Stream the body to a temp file: Content-Length, filename, magic bytes
+    # and size cap are checked before / as data arrives
+    try:
+        upload = await spool_pdf_request(request)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
     logger.info(f"\n{'='*50}")
-    logger.info(f"[FILE] ONBOARDING: {file.filename}")
+    logger.info(f"[FILE] ONBOARDING: {upload.filename}")
     logger.info(f"{'='*50}")
-    
-    # Validate file
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files accepted")
-    
-    content = await file.read()
-    
-    if len(content) == 0:
-        raise HTTPException(status_code=400, detail="Empty file")
-    
-    if len(content) > 10 * 1024 * 1024:  # 10MB
-        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
+    content_sha256 = upload.sha256
     
     try:
+        # Same file as before: skip parsing, the LLM and the database write
+        if not force_refresh:
+            existing = await supabase_service.get_profile_by_content_hash(content_sha256)
+            if existing:
+                logger.info(f"[INFO] Unchanged CV for {existing.get('email')}, reusing profile")
+                return OnboardingResponse(
+                    success=True,
+                    profile=_profile_response(existing),
+                    message=f"Profile already up to date for {existing.get('full_name')}"
+                )
+        
         # Validate PDF
-        if not PDFParser.validate_pdf(content):
+        if not PDFParser.validate_pdf(upload.path):
             raise HTTPException(status_code=400, detail="Invalid PDF file")
         
         # Extract text
-        cv_text = await PDFParser.extract_text(content)
+        cv_text = await PDFParser.extract_text(upload.path)
         
         if len(cv_text) < 50:
             raise HTTPException(status_code=422, detail="Could not extract text from PDF")
@@ -50,22 +88,24 @@ async def onboard_user(file: UploadFile = File(..., description="PDF Resume")):
         # Parse with AI
         profile_data = await cerebras_client.structure_cv(cv_text)
         profile_data["cv_text"] = cv_text
+        profile_data["content_sha256"] = content_sha256
         
         # Save to database
         saved_profile = await supabase_service.create_profile(profile_data)
         
+        # Embed the full CV locally for /jobs/similar
+        if profile_data.get("email"):
+            if embedding_index.available:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, embedding_index.add_profile, profile_data["email"], profile_data)
+            # Warm profile_results so the first resume-mode search is instant
+            profile_refresher.prefetch(profile_data)
+        
         logger.info("[SUCCESS] Onboarding complete!")
         
         return OnboardingResponse(
             success=True,
-            profile=ProfileResponse(
-                id=saved_profile.get("id", ""),
-                full_name=saved_profile.get("full_name", ""),
-                email=saved_profile.get("email", ""),
-                skills=saved_profile.get("skills", []),
-                location=saved_profile.get("location", ""),
-                experience_summary=saved_profile.get("experience_summary", "")
-            ),
+            profile=_profile_response(saved_profile),
             message=f"Profile created for {saved_profile.get('full_name')}"
         )
         
@@ -75,4 +115,6 @@ async def onboard_user(file: UploadFile = File(..., description="PDF Resume")):
         import traceback
         traceback.print_exc()
         logger.error(f"[ERROR] Onboarding failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.remove()
\ No newline at end of file
@@ -1,98 +1,250 @@
 # D:\AutoJobFinder\sdr-job-agent\backend\app\routers\search.py
 
-from fastapi import APIRouter, Query
-from typing import List
-from pydantic import BaseModel
-
-router = APIRouter()
-
-# This is what frontend expects
-class JobResponse(BaseModel):
-    title: str
-    company: str | None = None
-    url: str
-    location: str | None = None
-    description: str | None = None
-
-class SearchResponse(BaseModel):
-    success: bool = True
-    query: str
-    count: int
-    jobs: List[JobResponse]
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import List, Dict, Optional, Set, Tuple
 
+from app.models import SearchResponse
+from app.responses import render, job_payloads
 from app.services.tavily_client import tavily_client
 from app.services.supabase_service import supabase_service
 from app.services.cerebras_client import cerebras_client
+from app.services.ranking import rank_jobs, result_quality
+from app.services.pipeline import StageGraph
+from app.services.profile_refresher import profile_refresher
+from app.services.dedup import collapse_in_executor
+from app.config import settings
 import re
 
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+EMAIL_REGEX = r"[^@]+@[^@]+\.[^@]+"
+
+# Fire-and-forget history writes (kept referenced until done)
+_background: Set[asyncio.Task] = set()
+
+
+def _record_search(email: str, query: str, searched_at: Optional[str] = None) -> None:
+    task = asyncio.create_task(supabase_service.record_search(email, query, searched_at))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def _is_stale(refreshed_at: Optional[str]) -> bool:
+    """Saved result set past saved_results_max_age_minutes (or undated)"""
+    try:
+        refreshed = datetime.fromisoformat((refreshed_at or "").replace("Z", "+00:00"))
+    except ValueError:
+        return True
+    if refreshed.tzinfo is not None:
+        refreshed = refreshed.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime.utcnow() - refreshed > timedelta(minutes=settings.saved_results_max_age_minutes)
+
+
+def search_payload(query: str, jobs: List[Dict], cached: bool = False, degraded: bool = False,
+                   graph: Optional[StageGraph] = None, since: Optional[str] = None) -> Dict:
+    """SearchResponse as a plain dict (jobs are trusted, no re-validation)"""
+    payload_jobs = job_payloads(j for j in jobs if j.get("title") and j.get("url"))
+    payload = {
+        "success": True,
+        "query": query,
+        "count": len(payload_jobs),
+        "jobs": payload_jobs,
+        "cached": cached,
+        "degraded": degraded
+    }
+    if since is not None:
+        payload["since"] = since
+    if graph is not None:
+        payload["latency_ms"] = graph.elapsed_ms
+        payload["timings_ms"] = graph.timings_ms
+    return payload
+
+
+async def live_search(search_query: str) -> Tuple[List[Dict], bool]:
+    """Tavily results, or stored jobs (degraded=True) if Tavily is down or its circuit is open"""
+    try:
+        return await tavily_client.search_jobs(search_query), False
+    except Exception as e:
+        logger.warning(f"[WARN] Live search unavailable ({e}), serving stored jobs")
+        return await supabase_service.search_stored_jobs(search_query), True
+
+
+async def _pick_results(graph: StageGraph, fallback_query: str, location: str) -> Tuple[str, List[Dict], bool]:
+    """
+    Join the LLM-query search and the speculative skills-query search.
+    
+    Waits for both until the deadline, then keeps the better finished set
+    (non-degraded first, then result_quality, LLM query on ties). If
+    neither has finished by the deadline, takes whichever finishes first.
+    """
+    primary = graph.task("primary_search")
+    speculative = graph.task("speculative_search")
+    remaining = settings.speculative_deadline_seconds - graph.elapsed_ms / 1000
+    await asyncio.wait({primary, speculative}, timeout=max(0.0, remaining))
+    if not primary.done() and not speculative.done():
+        await asyncio.wait({primary, speculative}, return_when=asyncio.FIRST_COMPLETED)
+    
+    candidates = []
+    if primary.done() and not primary.cancelled() and primary.exception() is None:
+        jobs, degraded = primary.result()
+        candidates.append((not degraded, result_quality(jobs, location), 1, graph.task("llm_query").result(), jobs, degraded))
+    if speculative.done() and not speculative.cancelled() and speculative.exception() is None:
+        jobs, degraded = speculative.result()
+        candidates.append((not degraded, result_quality(jobs, location), 0, fallback_query, jobs, degraded))
+    graph.cancel(["llm_query", "primary_search", "speculative_search"])
+    if not candidates:
+        # Both searches failed outright (not just degraded): surface the error
+        for task in (primary, speculative):
+            if task.done() and not task.cancelled() and task.exception():
+                raise task.exception()
+        raise RuntimeError("Search pipeline produced no results")
+    
+    _, _, _, chosen_query, jobs, degraded = max(candidates, key=lambda c: c[:3])
+    logger.info(f"[INFO] Using results for '{chosen_query}' ({len(jobs)} jobs)")
+    return chosen_query, jobs, degraded
+
+
+async def new_since(request: Request, graph: StageGraph, search_queries: List[str], cutoff: str,
+                    location: str, query: str, email: Optional[str] = None,
+                    history_query: Optional[str] = None) -> Response:
+    """
+    Only postings first stored after `cutoff` by these searches (indexed lookup, no live search).
+
+    With `email`, records the search with the newest created_at returned
+    (or the old cutoff if nothing was new) as its watermark, so postings
+    stored while this ran are still new next time.
+    """
+    jobs = await supabase_service.get_jobs_since(search_queries, cutoff)
+    if email:
+        seen_up_to = max((job.get("created_at") or "" for job in jobs), default="") or cutoff
+        _record_search(email, history_query or query, seen_up_to)
+    sorted_jobs = await collapse_in_executor(rank_jobs(jobs, location), settings.dedup_threshold)
+    logger.info(f"[INFO] {len(sorted_jobs)} new postings since {cutoff}")
+    return render(search_payload(query, sorted_jobs, cached=True, graph=graph, since=cutoff), request)
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search_jobs(
-    query: str = Query(..., min_length=3, description="e.g. Python internship Islamabad")
+    request: Request,
+    query: str = Query(..., min_length=3, description="e.g. Python internship Islamabad"),
+    refresh: bool = Query(default=False, description="Resume mode: skip saved results and search live"),
+    only_new: bool = Query(default=False, description="Resume mode: only postings first seen since your last search"),
+    since: Optional[datetime] = Query(default=None, description="Only postings first seen after this (ISO time)")
 ):
-    actual_query = query
-    is_auto = False
+    graph = StageGraph()
+    email = query.strip()
+    profile = None
+    is_resume = bool(re.match(EMAIL_REGEX, email))
+
+    # 0. Incremental mode: answer from jobs stored since the cutoff
+    if only_new or since:
+        if not is_resume:
+            if not since:
+                raise HTTPException(status_code=400, detail="only_new needs a resume-mode (email) query; use since= for keyword searches")
+            return await new_since(request, graph, [query], since.isoformat(), "", query)
+        history, profile = await asyncio.gather(
+            supabase_service.get_search_history(email),
+            supabase_service.get_profile_by_email(email)
+        )
+        cutoff = since.isoformat() if since else (history[0]["searched_at"] if history else None)
+        if cutoff and profile:
+            # Resume-mode postings are stored under the email; past
+            # generated queries cover the refresher's and older searches
+            queries = list(dict.fromkeys([email] + [h["query"] for h in history if h.get("query")]))
+            return await new_since(request, graph, queries, cutoff, profile.get("location") or "", query,
+                                   email=email, history_query=history[0]["query"] if history else query)
+        # First search for this user: nothing to diff against, run a full search
+        profile = None
 
     # 1. Check if query is an email (Resume Mode)
-    email_regex = r"[^@]+@[^@]+\.[^@]+"
-    if re.match(email_regex, query.strip()):
-        profile = await supabase_service.get_profile_by_email(query.strip())
-        
-        if profile:
-            location = profile.get("location", "")
-            print(f"DEBUG: Found profile for {query.strip()}. Location in DB: '{location}'")
-            
-            # Generate optimized query from profile
-            actual_query = await cerebras_client.generate_search_query(
-                skills=profile.get("skills", []),
+    if is_resume:
+        async def _saved():
+            if refresh:
+                return None
+            await profile_refresher.join_prefetch(email)
+            saved = await supabase_service.get_profile_results(email)
+            if saved and _is_stale(saved.get("refreshed_at")):
+                logger.info(f"[INFO] Saved results for {email} are from {saved.get('refreshed_at')}, searching live")
+                return None
+            return saved
+
+        async def _profile():
+            return await supabase_service.get_profile_by_email(email)
+
+        # Saved-result lookup and profile fetch overlap
+        graph.add("saved", _saved).add("profile", _profile)
+        graph.start()
+        saved = await graph.task("saved")
+        if saved and saved.get("jobs"):
+            # Answer from the background refresher's result set
+            graph.cancel()
+            # The saved set covers postings up to its refresh, not up to now
+            _record_search(email, saved.get("query") or query, saved.get("refreshed_at"))
+            return render(search_payload(saved.get("query") or query, saved["jobs"], cached=True, graph=graph), request)
+        profile = await graph.task("profile")
+
+    if profile:
+        location = profile.get("location") or ""
+        skills = profile.get("skills") or []
+        logger.info(f"[INFO] Found profile for {email}. Location in DB: '{location}'")
+        fallback_query = cerebras_client.fallback_search_query(skills, location)
+
+        async def _llm_query():
+            return await cerebras_client.generate_search_query(
+                skills=skills,
                 experience=profile.get("experience_summary", ""),
                 location=location
             )
-            print(f"DEBUG: AI Generated Query: '{actual_query}'")
-            is_auto = True
+
+        async def _primary_search(llm_query):
+            if settings.speculative_search and llm_query == fallback_query:
+                return await graph.task("speculative_search")
+            return await live_search(llm_query)
+
+        # 2. Generate the LLM query and, meanwhile, search with the skills query
+        graph.add("llm_query", _llm_query)
+        graph.add("primary_search", _primary_search, "llm_query")
+        if settings.speculative_search:
+            graph.add("speculative_search", lambda: live_search(fallback_query))
+            graph.start()
+            actual_query, jobs, degraded = await _pick_results(graph, fallback_query, location)
         else:
-            # Fallback if profile not found (although ideally we'd warn contextually)
-            # For now, we search just in case, or we could return empty.
-            pass
+            results = await graph.run("llm_query", "primary_search")
+            actual_query = results["llm_query"]
+            jobs, degraded = results["primary_search"]
+        logger.info(f"[INFO] AI Generated Query: '{actual_query}'")
+    else:
+        location = ""
+        actual_query = query
+        graph.add("search", lambda: live_search(actual_query))
+        jobs, degraded = (await graph.run("search"))["search"]
 
-    # 2. Search with the determined query
-    jobs = await tavily_client.search_jobs(actual_query)
-    
-    # Save to DB
-    if jobs:
-        await supabase_service.store_jobs(jobs, query)
-    
-    # 3. Prioritize by Location
-    user_location = ""
-    if re.match(email_regex, query.strip()):
-        profile = await supabase_service.get_profile_by_email(query.strip())
-        if profile:
-            user_location = profile.get("location", "").lower()
-            
-    def get_sort_score(job):
-        job_loc = (job.get("location") or "").lower()
-        if not user_location or not job_loc:
-            return 0
-        # If user location is in job location or vice versa
-        if user_location in job_loc or job_loc in user_location:
-            return 10
-        return 0
-
-    sorted_jobs = sorted(jobs, key=get_sort_score, reverse=True)
-
-    # Convert to proper format
-    formatted_jobs = [
-        JobResponse(
-            title=j["title"],
-            company=j.get("company"),
-            url=j["url"],
-            location=j.get("location"),
-            description=j.get("description")
-        )
-        for j in sorted_jobs
-    ]
-    
-    return SearchResponse(
-        query=actual_query if is_auto else query,
-        count=len(formatted_jobs),
-        jobs=formatted_jobs
-    )
\ No newline at end of file
+    # 3. Prioritize by location; same role on several boards -> one entry
+    sorted_jobs = await collapse_in_executor(rank_jobs(jobs, location), settings.dedup_threshold)
+
+    # 4. Persist in parallel: new postings, and the saved set for resume mode
+    if not degraded:
+        async def _store():
+            if jobs:
+                # Counts what was searched (the generated query in resume mode), not the email
+                await supabase_service.store_jobs(jobs, query, counted_query=actual_query)
+
+        async def _save():
+            if profile:
+                await supabase_service.save_profile_results(email, actual_query, sorted_jobs)
+
+        graph.add("store", _store).add("save_results", _save)
+        await graph.run("store", "save_results")
+
+    if profile:
+        # After the store, so this search's own postings (created_at set
+        # during the insert) are older than the watermark
+        _record_search(email, actual_query)
+
+    return render(search_payload(actual_query, sorted_jobs, degraded=degraded, graph=graph), request)
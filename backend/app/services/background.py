@@ -0,0 +1,92 @@
+"""Periodic background passes that run in exactly one worker"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
+from app.services import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+class SingleWorkerLoop:
+    """
+    Base for a periodic pass (profile refresh, retention...).
+
+    With several workers only the one holding an exclusive lock on the
+    job's lock file runs the loop; the lock is released with the process,
+    so another worker takes over after a restart. The lock file also
+    records when the last pass started, so a restart waits out the rest of
+    the interval instead of running a full pass (re-crawling every
+    profile) on every deploy. A failed pass is logged and retried on the
+    next interval. Subclasses set `tag` and implement `run_pass`.
+    """
+
+    tag = "LOOP"
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock_fd: Optional[int] = None
+
+    async def run_pass(self) -> None:
+        raise NotImplementedError
+
+    def start_loop(self, lock_file: str, interval_seconds: float) -> bool:
+        """Start the loop in this worker; False if it's running or another worker holds the lock"""
+        if self._task:
+            return False
+        if not self._acquire_lock(lock_file):
+            logger.info(f"[{self.tag}] Another worker owns this job")
+            return False
+        delay = max(0.0, self._last_pass() + interval_seconds - time.time())
+        self._task = asyncio.create_task(self._loop(interval_seconds, delay))
+        return True
+
+    async def stop_loop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _loop(self, interval_seconds: float, delay: float):
+        if delay:
+            logger.info(f"[{self.tag}] Last pass was recent, next in {delay / 60:.0f} min")
+        await asyncio.sleep(delay)
+        while True:
+            self._record_pass()
+            try:
+                await self.run_pass()
+            except Exception as e:
+                logger.error(f"[{self.tag}] Pass failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def _acquire_lock(self, lock_file: str) -> bool:
+        os.makedirs(os.path.dirname(lock_file) or ".", exist_ok=True)
+        fd = os.open(lock_file, os.O_CREAT | os.O_RDWR, 0o644)
+        if not file_lock.lock(fd, blocking=False):
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _last_pass(self) -> float:
+        """Start time of the last pass recorded in the lock file (0 if none)"""
+        try:
+            os.lseek(self._lock_fd, 0, os.SEEK_SET)
+            return float(os.read(self._lock_fd, 64).decode().strip() or 0)
+        except (OSError, ValueError):
+            return 0.0
+
+    def _record_pass(self) -> None:
+        try:
+            os.lseek(self._lock_fd, 0, os.SEEK_SET)
+            os.write(self._lock_fd, f"{time.time():.0f}\n".encode().ljust(16))
+        except OSError as e:
+            logger.warning(f"[{self.tag}] Could not record pass time: {e}")
@@ -1,89 +1,142 @@
 """Cerebras LLM client"""
 
 import json
+import time
 import logging
 import asyncio
+from collections import deque
 from typing import Dict, Any, List
 from openai import OpenAI
 from app.config import settings
+from app.services.fork_safe import ForkSafeClient
+from app.services.cv_extractor import extract_fields, FIELDS as CV_FIELDS
+from app.services.prompt_budget import count_tokens, fit_sections, fit_sentences, fit_items
 
 logger = logging.getLogger(__name__)
 
+CV_FIELD_HINTS = {
+    "full_name": '"Person\'s name"',
+    "email": '"email@example.com"',
+    "phone": '"phone number or empty"',
+    "location": '"City, Country (e.g. Islamabad, Pakistan)"',
+    "skills": '["skill1", "skill2", "skill3"]',
+    "experience_summary": '"2-3 sentence summary"',
+}
 
-class CerebrasClient:
+# Words that mark the CV sections each field is found in
+CV_SECTION_HINTS = {
+    "full_name": [],
+    "email": ["email", "contact"],
+    "phone": ["phone", "mobile", "contact"],
+    "location": ["address", "location", "city", "based"],
+    "skills": ["skills", "technologies", "tools", "competencies", "expertise"],
+    "experience_summary": ["experience", "summary", "profile", "objective", "employment", "work"],
+}
+
+
+class CerebrasClient(ForkSafeClient):
     """Client for Cerebras Cloud (OpenAI-compatible)"""
     
     def __init__(self):
-        self.client = OpenAI(
+        self.client = self._create_client()
+        self.model = settings.cerebras_model
+        # Per-call token/latency records (recent) and per-method totals
+        self.calls: deque = deque(maxlen=500)
+        self._usage: Dict[str, Dict[str, float]] = {}
+        logger.info(f"[INFO] Cerebras initialized: {self.model}")
+    
+    def _create_client(self) -> OpenAI:
+        return OpenAI(
             api_key=settings.cerebras_api_key,
             base_url=settings.cerebras_base_url
         )
-        self.model = settings.cerebras_model
-        logger.info(f"[INFO] Cerebras initialized: {self.model}")
     
-    async def structure_cv(self, cv_text: str) -> Dict[str, Any]:
-        """Parse CV and return structured data"""
+    async def structure_cv(self, cv_text: str, use_rules: bool = True) -> Dict[str, Any]:
+        """Parse CV and return structured data (patterns first, LLM only for gaps)"""
+        if use_rules:
+            data, missing = extract_fields(cv_text)
+            logger.info(f"[INFO] Rule-based CV fields done, LLM needed for: {missing}")
+        else:
+            data, missing = {}, list(CV_FIELDS)
+        
+        if not missing:
+            return data
+        
         logger.info("[INFO] Structuring CV with AI...")
+        budget = settings.cv_gap_prompt_tokens if use_rules else settings.cv_prompt_tokens
+        prompt = self._cv_prompt(cv_text, missing, budget)
+
+        try:
+            result = await self._complete(
+                "structure_cv",
+                [
+                    {"role": "system", "content": "You are a CV parser. Return only valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=500 if len(missing) == len(CV_FIELDS) else 300
+            )
+            result = self.strip_json_fence(result)
+            llm_data = json.loads(result)
+            
+        except Exception as e:
+            logger.error(f"[ERROR] CV parsing failed: {e}")
+            # Rules already found the essentials: degrade instead of failing
+            if use_rules and data.get("email"):
+                return {**data, "experience_summary": ""}
+            raise
         
-        prompt = f"""Analyze this CV/Resume and extract information as JSON.
+        for field in missing:
+            value = llm_data.get(field)
+            if field == "skills" and data.get("skills"):
+                # Keep dictionary hits, add what only the LLM spotted
+                value = data["skills"] + [s for s in (value or []) if s not in data["skills"]]
+            if value:
+                data[field] = value
+            else:
+                data.setdefault(field, [] if field == "skills" else "")
+        logger.info(f"[SUCCESS] Parsed CV for: {data.get('full_name')} at {data.get('location')}")
+        return data
+    
+    @staticmethod
+    def strip_json_fence(result: str) -> str:
+        """Body of a ```json fenced reply (or the reply itself)"""
+        result = result.strip()
+        # Clean markdown if present
+        if "```" in result:
+            result = result.split("```")[1]
+            if result.startswith("json"):
+                result = result[4:]
+        return result.strip()
+    
+    @staticmethod
+    def _cv_prompt(cv_text: str, fields: List[str], budget_tokens: int) -> str:
+        field_lines = ",\n".join(f'    "{f}": {CV_FIELD_HINTS[f]}' for f in fields)
+        # Header (name/contact) plus the sections the missing fields live in
+        hints = [word for f in fields for word in CV_SECTION_HINTS[f]]
+        return f"""Analyze this CV/Resume and extract information as JSON.
         
 CV Text:
-{cv_text[:4000]}
+{fit_sections(cv_text, budget_tokens, hints)}
 
 Return valid JSON:
 {{
-    "full_name": "Person's name",
-    "email": "email@example.com",
-    "phone": "phone number or empty",
-    "location": "City, Country (e.g. Islamabad, Pakistan)",
-    "skills": ["skill1", "skill2", "skill3"],
-    "experience_summary": "2-3 sentence summary"
+{field_lines}
 }}
 
 Return ONLY JSON, nothing else."""
-
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a CV parser. Return only valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=500
-                )
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Clean markdown if present
-            if "```" in result:
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-            
-            data = json.loads(result.strip())
-            logger.info(f"[SUCCESS] Parsed CV for: {data.get('full_name')} at {data.get('location')}")
-            return data
-            
-        except Exception as e:
-            logger.error(f"[ERROR] CV parsing failed: {e}")
-            raise
     
     async def generate_search_query(self, skills: List[str], experience: str, location: str = "") -> str:
         """Generate optimized job search query"""
         logger.info(f"[INFO] Generating search query with location: {location}...")
         
         skills_str = ", ".join(skills[:8])
-        location_clause = f" in {location}" if location else " (Remote or localized)"
+        experience_str = fit_sentences(experience, settings.query_experience_tokens, skills)
         
         prompt = f"""Create a job search query based on this profile:
 
 Skills: {skills_str}
-Experience: {experience[:300]}
+Experience: {experience_str}
 Target Location: {location if location else "Anywhere (MUST prioritize Remote or local to the user)"}
 
 Instructions:
@@ -95,20 +148,13 @@ Instructions:
 Return ONLY the search query in English. No other characters or languages. """
 
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.2,
-                    max_tokens=50
-                )
+            query = await self._complete(
+                "generate_search_query",
+                [{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=50
             )
-            
-            query = response.choices[0].message.content.strip().strip('"\'')
+            query = query.strip().strip('"\'')
             # Extra safety: if location is missing from query but exists in profile, append it
             if location and location.lower() not in query.lower():
                 query = f"{query} in {location}"
@@ -118,23 +164,36 @@ Return ONLY the search query in English. No other characters or languages. """
             
         except Exception as e:
             logger.error(f"[ERROR] Query generation failed: {e}")
-            return f"{' '.join(skills[:3])}{location_clause} jobs"
+            return self.fallback_search_query(skills, location)
+    
+    @staticmethod
+    def fallback_search_query(skills: List[str], location: str = "") -> str:
+        """Deterministic query from the top skills (no LLM call)"""
+        location_clause = f" in {location}" if location else " (Remote or localized)"
+        return f"{' '.join(skills[:3])}{location_clause} jobs"
 
-    async def generate_cover_letter(self, user_name: str, skills: List[str], experience: str, job_title: str, company: str, job_description: str) -> str:
-        """Generate a human-like cover letter"""
+    async def generate_cover_letter(self, user_name: str, skills: List[str], experience: str, job_title: str, company: str, job_description: str, strict: bool = False) -> str:
+        """Generate a human-like cover letter (strict=True raises instead of returning a fallback)"""
         logger.info(f"[INFO] Generating cover letter for {company}...")
         
+        # Skills the posting mentions go first; description sentences that
+        # match the role and skills are kept over boilerplate
+        jd_terms = [job_title] + list(skills)
+        skills_str = fit_items(skills, settings.cover_letter_skills_tokens, [job_title, job_description])
+        experience_str = fit_sentences(experience, settings.cover_letter_experience_tokens, jd_terms + [job_description])
+        description_str = fit_sentences(job_description, settings.cover_letter_jd_tokens, jd_terms)
+        
         prompt = f"""Write a professional yet natural cover letter for this job application.
 
 My Details:
 Name: {user_name}
-Skills: {', '.join(skills)}
-Experience: {experience}
+Skills: {skills_str}
+Experience: {experience_str}
 
 Job Details:
 Role: {job_title}
 Company: {company}
-Description: {job_description[:800]}
+Description: {description_str}
 
 Instructions:
 1. Tone: Professional, confident, but conversational (human-like).
@@ -149,28 +208,66 @@ Instructions:
 Write ONLY the letter body."""
 
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a professional career coach. Write in simple, persuasive English."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=600
-                )
+            letter = await self._complete(
+                "generate_cover_letter",
+                [
+                    {"role": "system", "content": "You are a professional career coach. Write in simple, persuasive English."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=600
             )
-            
-            letter = response.choices[0].message.content.strip()
+            letter = letter.strip()
             logger.info("[SUCCESS] Cover letter generated")
             return letter
             
         except Exception as e:
             logger.error(f"[ERROR] Cover letter generation failed: {e}")
+            if strict:
+                raise
             return "Could not generate cover letter at this time. Please try again."
 
+    
+    async def _complete(self, method: str, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Chat completion in the executor; records tokens and latency for `method`"""
+        start = time.perf_counter()
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(
+            None,
+            lambda: self.client.chat.completions.create(model=self.model, messages=messages, **kwargs)
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+        content = response.choices[0].message.content or ""
+        
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or sum(count_tokens(m["content"]) for m in messages)
+        completion_tokens = getattr(usage, "completion_tokens", None) or count_tokens(content)
+        self.calls.append({
+            "method": method,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency_ms": round(latency_ms, 1),
+        })
+        totals = self._usage.setdefault(method, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0})
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["latency_ms"] += latency_ms
+        logger.info(f"[LLM] {method}: {prompt_tokens} prompt + {completion_tokens} completion tokens, {latency_ms:.0f} ms")
+        return content
+    
+    def usage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Average prompt/completion tokens and latency per method since startup"""
+        return {
+            method: {
+                "calls": t["calls"],
+                "avg_prompt_tokens": round(t["prompt_tokens"] / t["calls"], 1),
+                "avg_completion_tokens": round(t["completion_tokens"] / t["calls"], 1),
+                "avg_latency_ms": round(t["latency_ms"] / t["calls"], 1),
+            }
+            for method, t in self._usage.items()
+        }
+
 
 # Singleton
 cerebras_client = CerebrasClient()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Circuit breaker for flaky upstream services"""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through, consecutive failures are counted.
+    Open: after `failure_threshold` failures calls are refused for
+    `reset_timeout` seconds.
+    Half-open: then up to `half_open_max` probe calls are let through; a
+    success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_max: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info(f"[BREAKER] {self.name}: half-open, probing")
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (counts half-open probes)"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot whose call ended without a result (e.g. cancelled)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"[BREAKER] {self.name}: closed")
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(f"[BREAKER] {self.name}: open after {self._failures} failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
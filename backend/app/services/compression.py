@@ -0,0 +1,33 @@
+"""Text compression for large stored blobs (CV text, archives)"""
+
+import base64
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zlib fallback
+    zstandard = None
+
+ZSTD_LEVEL = 10
+
+
+def compress_text(text: str) -> str:
+    """Compress to a "<codec>:<base64>" string that fits a text column"""
+    raw = (text or "").encode("utf-8")
+    if zstandard is not None:
+        return "zstd:" + base64.b64encode(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)).decode("ascii")
+    return "zlib:" + base64.b64encode(zlib.compress(raw, 9)).decode("ascii")
+
+
+def decompress_text(blob: str) -> str:
+    if not blob:
+        return ""
+    codec, _, payload = blob.partition(":")
+    data = base64.b64decode(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed text")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown compression codec: {codec}")
@@ -0,0 +1,170 @@
+"""Deterministic CV field extraction (runs before any LLM call)"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w(])(?:\+|00|\()?\d[\d\s().-]{7,16}\d(?![\w])")
+# "Phone: ...", "Mobile # ...", "Tel. ..." in front of the number
+PHONE_LABEL_RE = re.compile(r"\b(?:phone|tel|telephone|mobile|mob|cell|whatsapp|contact)\b[.:#\s-]{0,4}(?:no\.?|number)?[.:#\s-]{0,3}$", re.I)
+# Year ranges and dates that PHONE_RE also matches ("2019 - 2022", "12.03.2021")
+_DATE_RE = re.compile(
+    r"\b(?:19|20)\d{2}\s*[-/.\u2013]\s*(?:(?:19|20)?\d{2})\b"
+    r"|\b\d{1,2}[./-]\d{1,2}[./-](?:19|20)?\d{2}\b"
+)
+LOCATION_LINE_RE = re.compile(r"^\s*(?:location|address|based in|city)\s*[:\-]\s*(.+)$", re.I | re.M)
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+_NAME_WORD_RE = re.compile(r"^[A-Z][a-zA-Z'\-]+$|^[A-Z]\.?$")
+# Capitalized header lines that aren't a name: headings and common job titles
+NAME_STOPWORDS = {
+    "resume", "cv", "curriculum", "vitae", "summary", "profile", "professional", "contact",
+    "objective", "career", "experience", "work", "employment", "education", "skills",
+    "personal", "information", "details", "references", "projects", "certifications",
+    "languages", "achievements", "about", "me", "history", "qualifications", "interests",
+    "sales", "development", "representative", "manager", "engineer", "developer",
+    "executive", "specialist", "analyst", "associate", "intern", "officer", "consultant",
+}
+
+# Lowercase phrase -> canonical skill. Phrases up to three words.
+SKILLS = {s.lower(): s for s in [
+    # Sales / SDR
+    "Cold Calling", "Lead Generation", "Prospecting", "Outbound Sales", "Inbound Sales",
+    "B2B Sales", "SaaS Sales", "Account Management", "Business Development", "Negotiation",
+    "CRM", "Salesforce", "HubSpot", "Pipedrive", "Zoho CRM", "Outreach", "Salesloft", "Apollo",
+    "LinkedIn Sales Navigator", "Sales Navigator", "Email Outreach", "Appointment Setting",
+    "Pipeline Management", "Customer Success", "Client Relations", "Market Research",
+    "Digital Marketing", "Social Media Marketing", "SEO", "Content Writing", "Copywriting",
+    "Customer Service", "Presentation", "Public Speaking", "Communication", "Team Leadership",
+    # Tools
+    "Excel", "Microsoft Excel", "Google Sheets", "PowerPoint", "Microsoft Office", "Tableau",
+    "Power BI", "Jira", "Notion", "Figma",
+    # Engineering
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "PHP", "Ruby",
+    "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "React", "Next.js", "Node.js", "Vue",
+    "Angular", "Django", "Flask", "FastAPI", "Spring", "Docker", "Kubernetes", "AWS", "Azure",
+    "GCP", "Git", "Linux", "REST APIs", "GraphQL", "Machine Learning", "Data Analysis",
+    "Pandas", "NumPy", "TensorFlow", "PyTorch", "HTML", "CSS", "Tailwind",
+]}
+_MAX_SKILL_WORDS = max(len(k.split()) for k in SKILLS)
+# Short or ambiguous words only count in their exact written form
+_CASE_SENSITIVE = {"go": "Go", "excel": "Excel", "outreach": "Outreach", "apollo": "Apollo",
+                   "presentation": "Presentation", "communication": "Communication", "spring": "Spring"}
+
+CITIES = {
+    "islamabad": "Pakistan", "lahore": "Pakistan", "karachi": "Pakistan", "rawalpindi": "Pakistan",
+    "faisalabad": "Pakistan", "peshawar": "Pakistan", "multan": "Pakistan",
+    "dubai": "United Arab Emirates", "abu dhabi": "United Arab Emirates", "riyadh": "Saudi Arabia",
+    "london": "United Kingdom", "manchester": "United Kingdom", "new york": "USA",
+    "san francisco": "USA", "toronto": "Canada", "berlin": "Germany", "amsterdam": "Netherlands",
+    "singapore": "Singapore", "sydney": "Australia", "bangalore": "India", "delhi": "India",
+}
+_CITY_RE = re.compile(r"\b(" + "|".join(re.escape(c) for c in sorted(CITIES, key=len, reverse=True)) + r")\b", re.I)
+
+FIELDS = ("full_name", "email", "phone", "location", "skills", "experience_summary")
+MIN_CONFIDENT_SKILLS = 5
+
+
+def _find_skills(text: str) -> List[str]:
+    """One pass over the tokens, matching 1-3 word phrases against SKILLS"""
+    tokens = [t.strip(".") or t for t in _TOKEN_RE.findall(text.lower())]
+    raw_words = set(re.findall(r"[A-Za-z]+", text))
+    found: Dict[str, None] = {}
+    i = 0
+    while i < len(tokens):
+        step = 1
+        # Longest phrase first, then skip past it ("LinkedIn Sales Navigator"
+        # shouldn't also count as "Sales Navigator")
+        for n in range(_MAX_SKILL_WORDS, 0, -1):
+            phrase = " ".join(tokens[i:i + n])
+            skill = SKILLS.get(phrase)
+            if skill is None:
+                continue
+            if phrase in _CASE_SENSITIVE and _CASE_SENSITIVE[phrase] not in raw_words:
+                continue
+            found[skill] = None
+            step = n
+            break
+        i += step
+    return list(found)
+
+
+def _find_name(lines: List[str]) -> Tuple[str, bool]:
+    """
+    (name, confident). The first 2-4 capitalized words in the header that
+    aren't a heading or job title. Confident only for a Title Case line
+    among the first three; an ALL CAPS line (names and section headers
+    look alike) or a later one is a guess for the LLM to confirm.
+    """
+    for i, line in enumerate(lines[:5]):
+        words = line.split()
+        if not 2 <= len(words) <= 4 or not all(_NAME_WORD_RE.match(w) for w in words):
+            continue
+        if any(w.lower().strip(".") in NAME_STOPWORDS for w in words):
+            continue
+        if line.isupper():
+            return " ".join(w.title() for w in words), False
+        return " ".join(words), i < 3
+    return "", False
+
+
+def _find_phone(text: str) -> Tuple[str, bool]:
+    """
+    (phone, confident). Confident means labelled ("Phone: ...") or in
+    international form (+92 / 0092); other digit runs are only a guess for
+    the LLM to confirm, and dates or year ranges never count.
+    """
+    guess = ""
+    for match in PHONE_RE.finditer(text):
+        number = " ".join(match.group(0).split())
+        digits = sum(c.isdigit() for c in number)
+        if _DATE_RE.search(number) or not 9 <= digits <= 15:
+            continue
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        if number.startswith(("+", "00")) or PHONE_LABEL_RE.search(text[line_start:match.start()]):
+            return number, True
+        guess = guess or number
+    return guess, False
+
+
+def _find_location(text: str) -> Tuple[str, bool]:
+    match = LOCATION_LINE_RE.search(text)
+    if match:
+        return match.group(1).strip()[:100], True
+    match = _CITY_RE.search(text[:1500])  # header area only
+    if match:
+        city = match.group(1).title()
+        return f"{city}, {CITIES[match.group(1).lower()]}", True
+    return "", False
+
+
+def extract_fields(cv_text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Extract what patterns can find reliably.
+
+    Returns (data, missing): `missing` lists fields that were not found or
+    are low confidence and still need the LLM. experience_summary always
+    needs it.
+    """
+    lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+    data: Dict[str, Any] = {}
+    missing: List[str] = []
+
+    email = EMAIL_RE.search(cv_text)
+    data["email"] = email.group(0) if email else ""
+    data["phone"], phone_ok = _find_phone(cv_text)
+    data["full_name"], name_ok = _find_name(lines)
+    data["location"], location_ok = _find_location(cv_text)
+    data["skills"] = _find_skills(cv_text)
+
+    if not data["email"]:
+        missing.append("email")
+    if not name_ok:
+        missing.append("full_name")
+    if not phone_ok:
+        missing.append("phone")
+    if not location_ok:
+        missing.append("location")
+    if len(data["skills"]) < MIN_CONFIDENT_SKILLS:
+        missing.append("skills")
+    missing.append("experience_summary")
+    return data, missing
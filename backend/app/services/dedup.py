@@ -0,0 +1,201 @@
+"""Near-duplicate detection for job postings (MinHash + LSH)"""
+
+import re
+import asyncio
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed coefficients so signatures are stable across processes and restarts
+_rng_state = hashlib.sha256(b"sdr-job-agent-minhash").digest()
+_PERMS: List[Tuple[int, int]] = []
+for _i in range(NUM_PERM):
+    _rng_state = hashlib.sha256(_rng_state).digest()
+    _PERMS.append((int.from_bytes(_rng_state[:8], "big") % _PRIME or 1,
+                   int.from_bytes(_rng_state[8:16], "big") % _PRIME))
+
+_BOARDS = r"(linkedin|indeed|glassdoor|rozee\.pk|jobee\.pk)"
+_BOARD_SUFFIX_RE = re.compile(r"\s*[-|]\s*" + _BOARDS + r"\b.*$", re.I)
+_BOARD_ONLY_RE = re.compile(r"^\s*" + _BOARDS + r"\s*$", re.I)
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _NON_WORD_RE.split((text or "").lower()) if t]
+
+
+def normalize_company(company: Optional[str]) -> str:
+    """Company as compared across boards: "Acme - LinkedIn" -> "acme", "Indeed" -> "" """
+    company = _BOARD_SUFFIX_RE.sub("", company or "")
+    if _BOARD_ONLY_RE.match(company):
+        return ""
+    return " ".join(_tokens(company))
+
+
+def has_description(job: Dict) -> bool:
+    """At least one description bigram to compare on"""
+    return len(_tokens(job.get("description"))) >= 2
+
+
+def shingles(job: Dict) -> set:
+    """Title words, company, and description word bigrams"""
+    title = _BOARD_SUFFIX_RE.sub("", job.get("title") or "")
+    out = {f"t:{t}" for t in _tokens(title)}
+    company = normalize_company(job.get("company"))
+    if company:
+        out.add(f"c:{company}")
+    words = _tokens(job.get("description"))
+    out.update(f"d:{a} {b}" for a, b in zip(words, words[1:]))
+    return out
+
+
+def minhash(features: set) -> Tuple[int, ...]:
+    if not features:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big")
+              for f in features]
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMS
+    )
+
+
+def signature(job: Dict) -> Tuple[int, ...]:
+    """
+    minhash(shingles(job)), memoized on the fields it reads: one /search
+    collapses, dedups and stores the same postings, ~2ms of pure Python each
+    """
+    return _signature(job.get("title") or "", job.get("company") or "", job.get("description") or "")
+
+
+@lru_cache(maxsize=2048)
+def _signature(title: str, company: str, description: str) -> Tuple[int, ...]:
+    return minhash(shingles({"title": title, "company": company, "description": description}))
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _bands(sig: Tuple[int, ...]):
+    for band in range(BANDS):
+        yield band, sig[band * ROWS:(band + 1) * ROWS]
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures.
+
+    A lookup only compares against postings sharing at least one band
+    bucket, so checks stay sub-linear in the number of indexed jobs.
+    Postings with different (known) companies never match, and a match
+    needs more than the title: the same company, or descriptions on both
+    sides ("SDR" and "Senior SDR" alone are different roles). With max_size
+    set, adding past it evicts the earliest-added posting (~4KB each).
+    """
+
+    def __init__(self, threshold: float = 0.6, max_size: int = 0):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._entries: Dict[str, Tuple[Tuple[int, ...], str, bool]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, job: Dict, sig: Optional[Tuple[int, ...]] = None) -> None:
+        sig = sig or signature(job)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (sig, normalize_company(job.get("company")), has_description(job))
+            for band in _bands(sig):
+                self._buckets.setdefault(band, []).append(key)
+            if self.max_size and len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def find(self, job: Dict, sig: Optional[Tuple[int, ...]] = None) -> Optional[str]:
+        """Key of the most similar indexed posting above threshold, if any"""
+        sig = sig or signature(job)
+        company = normalize_company(job.get("company"))
+        described = has_description(job)
+        best_key, best_score = None, self.threshold
+        with self._lock:
+            candidates = set()
+            for band in _bands(sig):
+                candidates.update(self._buckets.get(band, ()))
+            for key in candidates:
+                other_sig, other_company, other_described = self._entries[key]
+                if company and other_company and company != other_company:
+                    continue
+                if not (company and company == other_company) and not (described and other_described):
+                    continue  # title-only match
+                score = similarity(sig, other_sig)
+                if score >= best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in _bands(entry[0]):
+            bucket = self._buckets.get(band)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+
+
+def collapse(jobs: List[Dict], threshold: float = 0.6) -> List[Dict]:
+    """
+    Merge near-duplicate postings, keeping the first (best ranked) of each
+    cluster and moving the others' URLs into `alternate_urls`.
+    """
+    index = NearDuplicateIndex(threshold)
+    kept: Dict[str, Dict] = {}
+    order: List[str] = []
+    for job in jobs:
+        sig = signature(job)
+        match = index.find(job, sig)
+        if match is not None:
+            primary = kept[match]
+            alternates = primary.setdefault("alternate_urls", [])
+            for url in [job.get("url")] + list(job.get("alternate_urls") or []):
+                if url and url != primary.get("url") and url not in alternates:
+                    alternates.append(url)
+            continue
+        key = str(len(order))
+        kept[key] = {**job, "alternate_urls": list(job.get("alternate_urls") or [])}
+        order.append(key)
+        index.add(key, job, sig)
+    if len(order) < len(jobs):
+        logger.info(f"[DEDUP] Collapsed {len(jobs)} postings into {len(order)}")
+    return [kept[k] for k in order]
+
+
+async def collapse_in_executor(jobs: List[Dict], threshold: float = 0.6) -> List[Dict]:
+    """collapse() in a worker thread, so hashing a batch doesn't block the event loop"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, collapse, jobs, threshold)
@@ -0,0 +1,290 @@
+"""Local embedding index for matching CVs to stored jobs (no network, needs numpy)"""
+
+import os
+import re
+import zlib
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional; /jobs/similar is off without it
+    np = None
+
+from app.config import settings
+from app.services import file_lock
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "this to was we will with you your i my me".split()
+)
+
+
+def embed(text: str, dim: Optional[int] = None) -> "np.ndarray":
+    """Signed hashing vectorizer over unigrams + bigrams, log-scaled, L2-normalized"""
+    dim = dim or settings.embedding_dim
+    vec = np.zeros(dim, dtype=np.float32)
+    tokens = [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vec[h % dim] += -1.0 if h & 0x80000000 else 1.0
+    vec = np.sign(vec) * np.log1p(np.abs(vec))
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def job_text(job: Dict) -> str:
+    title = job.get("title") or ""
+    # Title counts double: it's the strongest signal in a short posting
+    return " ".join([title, title, job.get("company") or "", job.get("location") or "",
+                     job.get("description") or ""])
+
+
+def profile_text(profile: Dict) -> str:
+    return " ".join([" ".join(profile.get("skills") or []), profile.get("experience_summary") or "",
+                     profile.get("cv_text") or ""])
+
+
+class HyperplaneLSH:
+    """Random-hyperplane LSH tables with single-bit multi-probe"""
+
+    def __init__(self, dim: int, tables: int = 8, bits: int = 12, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.bits = bits
+        self.planes = rng.standard_normal((tables, dim, bits)).astype(np.float32)
+        self.weights = (1 << np.arange(bits)).astype(np.int64)
+        self.buckets: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(tables)]
+
+    def _codes(self, vecs: "np.ndarray") -> "np.ndarray":
+        bits = np.einsum("md,tdb->tmb", vecs, self.planes) > 0
+        return (bits * self.weights).sum(axis=-1)
+
+    def add(self, start: int, vecs: "np.ndarray") -> None:
+        for table, codes in zip(self.buckets, self._codes(vecs)):
+            for offset, code in enumerate(codes.tolist()):
+                table[code].append(start + offset)
+
+    def candidates(self, query: "np.ndarray") -> set:
+        rows = set()
+        for table, code in zip(self.buckets, self._codes(query[None, :])[:, 0].tolist()):
+            rows.update(table.get(code, ()))
+            for bit in range(self.bits):
+                rows.update(table.get(code ^ (1 << bit), ()))
+        return rows
+
+
+@contextmanager
+def _file_lock(path: str):
+    with open(path + ".lock", "w") as f:
+        file_lock.lock(f.fileno())
+        try:
+            yield
+        finally:
+            file_lock.unlock(f.fileno())
+
+
+def _read_tail(path: str, offset: int) -> bytes:
+    """Complete lines appended to `path` after `offset` (a half-written line is left for later)"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return b""
+    if size == offset:
+        return b""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    return data[:data.rfind(b"\n") + 1]
+
+
+class VectorStore:
+    """
+    Append-only vectors in a memory-mapped float32 matrix.
+
+    `<name>.f32` holds the rows, `<name>.keys` one key per line (row i is
+    line i). Vectors are written before their key, so any worker that sees
+    a key also sees its vector; other workers pick up new rows by reading
+    the tail of the keys file. Re-adding a key appends a new row that
+    supersedes the old one. Removing a key appends its row number to
+    `<name>.dead` (a tombstone); dead rows stay on disk until the store
+    is rebuilt but are never returned.
+    """
+
+    def __init__(self, name: str, dim: Optional[int] = None, directory: Optional[str] = None):
+        self.dim = dim or settings.embedding_dim
+        self.directory = directory or settings.embedding_dir
+        self.vec_path = os.path.join(self.directory, f"{name}.f32")
+        self.keys_path = os.path.join(self.directory, f"{name}.keys")
+        self.dead_path = os.path.join(self.directory, f"{name}.dead")
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._dead: set = set()
+        self._keys_offset = 0
+        self._dead_offset = 0
+        self._matrix: "Optional[np.memmap]" = None
+        self._lsh = HyperplaneLSH(self.dim)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return key in self._rows
+
+    def _open_matrix(self, rows_needed: int) -> None:
+        if self._matrix is not None and self._matrix.shape[0] >= rows_needed:
+            return
+        capacity = os.path.getsize(self.vec_path) // (self.dim * 4)
+        self._matrix = np.memmap(self.vec_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _refresh(self) -> None:
+        """Index rows and tombstones appended since we last looked (by us or another worker)"""
+        data = _read_tail(self.keys_path, self._keys_offset)
+        if data:
+            self._keys_offset += len(data)
+            start = len(self._keys)
+            for key in data.decode("utf-8").splitlines():
+                if len(self._keys) not in self._dead:
+                    self._rows[key] = len(self._keys)
+                self._keys.append(key)
+            self._open_matrix(len(self._keys))
+            self._lsh.add(start, np.asarray(self._matrix[start:len(self._keys)]))
+        dead = _read_tail(self.dead_path, self._dead_offset)
+        if dead:
+            self._dead_offset += len(dead)
+            for row in map(int, dead.split()):
+                self._dead.add(row)
+                # Only if that row is still the key's live one (not re-added since)
+                if row < len(self._keys) and self._rows.get(self._keys[row]) == row:
+                    del self._rows[self._keys[row]]
+
+    def add_many(self, items: Iterable[Tuple[str, "np.ndarray"]]) -> int:
+        items = [(key.replace("\n", " "), vec) for key, vec in items]
+        if not items:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, _file_lock(self.keys_path):
+            self._refresh()
+            start = len(self._keys)
+            needed = start + len(items)
+            capacity = os.path.getsize(self.vec_path) // (self.dim * 4) if os.path.exists(self.vec_path) else 0
+            if needed > capacity:
+                with open(self.vec_path, "ab"):
+                    pass
+                os.truncate(self.vec_path, max(1024, needed * 2) * self.dim * 4)
+                self._matrix = None
+            self._open_matrix(needed)
+            self._matrix[start:needed] = np.stack([vec for _, vec in items])
+            self._matrix.flush()
+            with open(self.keys_path, "ab") as f:
+                f.write("".join(f"{key}\n" for key, _ in items).encode("utf-8"))
+            self._refresh()
+        return len(items)
+
+    def remove_many(self, keys: Iterable[str]) -> int:
+        """Tombstone the live rows of these keys; returns how many were present"""
+        if not os.path.exists(self.keys_path):
+            return 0
+        with self._lock, _file_lock(self.keys_path):
+            self._refresh()
+            rows = [self._rows[key] for key in dict.fromkeys(keys) if key in self._rows]
+            if not rows:
+                return 0
+            with open(self.dead_path, "ab") as f:
+                f.write("".join(f"{row}\n" for row in rows).encode())
+            self._refresh()
+        return len(rows)
+
+    def get(self, key: str) -> "Optional[np.ndarray]":
+        with self._lock:
+            self._refresh()
+            row = self._rows.get(key)
+            return None if row is None else np.array(self._matrix[row])
+
+    def search(self, query: "np.ndarray", k: int) -> List[Tuple[str, float]]:
+        """Top-k keys by cosine similarity (vectors are normalized)"""
+        with self._lock:
+            self._refresh()
+            n = len(self._keys)
+            if n == 0:
+                return []
+            rows = None
+            if n > settings.embedding_exact_below:
+                candidates = self._lsh.candidates(query)
+                if len(candidates) >= k:
+                    rows = np.fromiter(candidates, dtype=np.int64)
+            if rows is None:
+                scores = np.concatenate([
+                    np.asarray(self._matrix[i:min(i + 65536, n)]) @ query
+                    for i in range(0, n, 65536)
+                ])
+                rows = np.arange(n)
+            else:
+                scores = np.asarray(self._matrix[np.sort(rows)]) @ query
+                rows = np.sort(rows)
+            # Skip rows superseded by a later add of the same key, or removed
+            live = np.fromiter((self._rows.get(self._keys[r]) == r for r in rows.tolist()), dtype=bool, count=len(rows))
+            rows, scores = rows[live], scores[live]
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            return [(self._keys[rows[i]], float(scores[i])) for i in top.tolist()]
+
+
+class EmbeddingIndex:
+    """Profile and job vectors plus nearest-job lookup (disabled when numpy is missing)"""
+
+    def __init__(self):
+        self.available = np is not None
+        if not self.available:
+            logger.warning("⚠️ numpy not installed: embedding index disabled (/jobs/similar returns 503)")
+            return
+        self.jobs = VectorStore("jobs")
+        self.profiles = VectorStore("profiles")
+
+    def add_jobs(self, rows: List[Dict]) -> int:
+        """Embed stored job rows; used as a store_jobs insert listener"""
+        if not self.available:
+            return 0
+        items = [(row["id"], embed(job_text(row))) for row in rows
+                 if row.get("id") and row["id"] not in self.jobs]
+        added = self.jobs.add_many(items)
+        if added:
+            logger.info(f"[INFO] Embedded {added} jobs")
+        return added
+
+    def remove_jobs(self, rows: List[Dict]) -> int:
+        """Tombstone deleted job rows; used as a delete_jobs listener"""
+        if not self.available:
+            return 0
+        removed = self.jobs.remove_many(row["id"] for row in rows if row.get("id"))
+        if removed:
+            logger.info(f"[INFO] Removed {removed} jobs from the embedding index")
+        return removed
+
+    def add_profile(self, email: str, profile: Dict) -> "Optional[np.ndarray]":
+        if not self.available:
+            return None
+        vec = embed(profile_text(profile))
+        self.profiles.add_many([(email, vec)])
+        return vec
+
+    def profile_vector(self, email: str) -> "Optional[np.ndarray]":
+        return self.profiles.get(email) if self.available else None
+
+    def similar_jobs(self, vec: "np.ndarray", k: int = 20) -> List[Tuple[str, float]]:
+        return self.jobs.search(vec, k)
+
+
+# Singleton
+embedding_index = EmbeddingIndex()
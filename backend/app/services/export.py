@@ -0,0 +1,61 @@
+"""Streaming bulk export of the jobs table (NDJSON / CSV, gzipped)"""
+
+import io
+import csv
+import json
+import zlib
+from typing import AsyncIterator, Dict, List, Optional
+from app.services.supabase_service import supabase_service
+
+# No search_query: resume-mode rows carry the user's email there, and the
+# export is unauthenticated
+EXPORT_COLUMNS = (
+    "id", "title", "company", "url", "location", "source",
+    "created_at", "alternate_urls", "description",
+)
+PAGE_SIZE = 1000
+
+
+async def iter_job_pages(since: Optional[str] = None, until: Optional[str] = None,
+                         source: Optional[str] = None, page_size: int = PAGE_SIZE) -> AsyncIterator[List[Dict]]:
+    """Keyset-paged walk over jobs; only one page is held at a time"""
+    after_id = None
+    while True:
+        page = await supabase_service.get_jobs_page(
+            ",".join(EXPORT_COLUMNS), after_id, page_size, since=since, until=until, source=source
+        )
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1]["id"]
+
+
+def ndjson_chunk(rows: List[Dict]) -> bytes:
+    return b"".join(json.dumps(row, ensure_ascii=False, default=str).encode() + b"\n" for row in rows)
+
+
+def csv_chunk(rows: List[Dict], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            " ".join(row.get(c) or []) if c == "alternate_urls" else row.get(c, "")
+            for c in EXPORT_COLUMNS
+        ])
+    return buffer.getvalue().encode()
+
+
+async def export_jobs(fmt: str = "ndjson", since: Optional[str] = None, until: Optional[str] = None,
+                      source: Optional[str] = None) -> AsyncIterator[bytes]:
+    """Gzip byte stream of the export; memory stays at one page regardless of table size"""
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    if fmt == "csv":
+        yield gz.compress(csv_chunk([], header=True))
+    async for page in iter_job_pages(since, until, source):
+        data = gz.compress(csv_chunk(page) if fmt == "csv" else ndjson_chunk(page))
+        if data:
+            yield data
+    yield gz.flush()
@@ -0,0 +1,43 @@
+"""Canonical URLs and content hashes for job postings"""
+
+import hashlib
+from typing import Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query params that only track the click, never identify the posting
+TRACKING_PARAMS = {
+    "trk", "trkinfo", "refid", "trackingid", "ref", "src", "from",
+    "originalsubdomain", "position", "pagenum", "eboid",
+}
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a posting URL so the same job always maps to one key"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    params = parse_qsl(parts.query, keep_blank_values=False)
+    if host.endswith("linkedin.com"):
+        # Search / collection pages name the job in currentJobId: that's the
+        # posting itself, under its /jobs/view/<id> URL
+        job_id = next((v for k, v in params if k.lower() == "currentjobid" and v.isdigit()), None)
+        if job_id:
+            path, params = f"/jobs/view/{job_id}", []
+    query = sorted(
+        (k, v) for k, v in params
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def content_hash(job: Dict) -> str:
+    """Hash of the fields we show, so a changed posting gets a new hash"""
+    parts = [
+        " ".join((job.get(field) or "").split()).lower()
+        for field in ("title", "company", "location", "description")
+    ]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,43 @@
+"""Fork-safe lazy client holder"""
+
+import os
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ForkSafeClient:
+    """
+    Base for services wrapping a network client.
+
+    The client is created lazily and re-created whenever the current
+    process id changes, so a client built in a preloading parent is never
+    reused by a forked worker (sockets and locks don't survive fork).
+    """
+
+    _client: Any = None
+    _client_pid: int = 0
+
+    def _create_client(self) -> Any:
+        raise NotImplementedError
+
+    @property
+    def client(self) -> Any:
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            if self._client is not None:
+                logger.info(f"[INFO] {type(self).__name__}: new process {pid}, recreating client")
+            self._client = self._create_client()
+            self._client_pid = pid
+        return self._client
+
+    @client.setter
+    def client(self, value: Any) -> None:
+        self._client = value
+        self._client_pid = os.getpid()
+
+    def reset_client(self) -> None:
+        """Drop the current client; the next access builds a new one"""
+        self._client = None
+        self._client_pid = 0
@@ -0,0 +1,223 @@
+"""Lazy full-posting hydration for stored jobs (fetched on first open, cached)"""
+
+import re
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from html import unescape
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.services.fork_safe import ForkSafeClient
+
+logger = logging.getLogger(__name__)
+
+_SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "svg", "form", "button"}
+_BLOCK_TAGS = {"p", "div", "li", "br", "h1", "h2", "h3", "h4", "section", "article", "tr", "ul", "ol"}
+_LD_JSON_RE = re.compile(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>', re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+MIN_BLOCK_CHARS = 40  # shorter text blocks are menus, buttons, cookie banners
+
+
+class _TextExtractor(HTMLParser):
+    """Visible text blocks, skipping chrome (nav, scripts, footers...)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._current.append(data)
+
+    def _flush(self):
+        text = " ".join("".join(self._current).split())
+        if text:
+            self.blocks.append(text)
+        self._current = []
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _job_posting_ld(html: str) -> Optional[str]:
+    """description of a schema.org JobPosting (LinkedIn, Greenhouse, Lever... embed one)"""
+    for raw in _LD_JSON_RE.findall(html):
+        try:
+            data = json.loads(raw.strip())
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else data.get("@graph", [data]):
+            if isinstance(item, dict) and item.get("@type") == "JobPosting" and item.get("description"):
+                text = _TAG_RE.sub("\n", unescape(item["description"]))
+                return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    return None
+
+
+def extract_posting(html: str) -> Tuple[str, str]:
+    """(full posting text, how it was found: "jsonld" or "html")"""
+    ld = _job_posting_ld(html)
+    if ld:
+        return ld, "jsonld"
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "\n".join(b for b in parser.blocks if len(b) >= MIN_BLOCK_CHARS), "html"
+
+
+class DetailCache:
+    """LRU cache bounded by entry count and total text size, with a TTL"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires, _, value = item
+        if expires < time.monotonic():
+            self._drop(key)
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        size = len(value.get("description") or "")
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._items[key] = (time.monotonic() + self.ttl, size, value)
+        self._bytes += size
+        while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._items)))
+
+    def _drop(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+
+class JobDetailService(ForkSafeClient):
+    """
+    Fetches and extracts a stored job's full posting on first access.
+
+    Results are cached per job id (DetailCache); concurrent requests for
+    the same job share one fetch. Downloads go through one pooled
+    httpx.AsyncClient and stop at `detail_max_bytes`.
+    """
+
+    def __init__(self):
+        self.cache = DetailCache(settings.detail_cache_entries, settings.detail_cache_bytes,
+                                 settings.detail_ttl_seconds)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=settings.detail_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={"User-Agent": "Mozilla/5.0 (compatible; SDRJobAgent/1.0)"}
+        )
+
+    def cached_text(self, job_id: Optional[str]) -> Optional[str]:
+        """Full description if it was already hydrated (never fetches)"""
+        detail = self.cache.get(job_id) if job_id else None
+        return detail.get("description") if detail and detail.get("source") != "stored" else None
+
+    async def get(self, job_id: str, load_job: Callable[[str], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        """Detail for a job id; `load_job` returns the stored row (None if unknown)"""
+        detail = self.cache.get(job_id)
+        if detail is not None:
+            return {**detail, "cached": True}
+        task = self._inflight.get(job_id)
+        first = task is None
+        if first:
+            # Detached from any one request, so a caller disconnecting (its
+            # handler being cancelled) doesn't cancel the fetch for the others
+            task = asyncio.create_task(self._hydrate(job_id, load_job))
+            self._inflight[job_id] = task
+            task.add_done_callback(lambda done: self._hydrated(job_id, done))
+        detail = await asyncio.shield(task)
+        return {**detail, "cached": not first} if detail else None
+
+    def _hydrated(self, job_id: str, task: asyncio.Task) -> None:
+        if self._inflight.get(job_id) is task:
+            del self._inflight[job_id]
+        if not task.cancelled():
+            task.exception()  # retrieved: no "never retrieved" warning if every caller left
+
+    async def _hydrate(self, job_id: str, load_job) -> Optional[Dict]:
+        job = await load_job(job_id)
+        if not job:
+            return None
+        detail = {
+            "id": job_id,
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "url": job.get("url"),
+            "description": job.get("description") or "",
+            "source": "stored",
+            "fetched_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            html = await self._fetch(job["url"])
+            text, found_by = await asyncio.to_thread(extract_posting, html)
+            if len(text) > len(detail["description"]):
+                detail["description"], detail["source"] = text, found_by
+        except Exception as e:
+            logger.warning(f"⚠️ Detail fetch failed for {job_id}: {e}")
+            detail["detail_error"] = str(e)
+            return detail  # not cached: try again next time
+
+        self.cache.set(job_id, detail)
+        return detail
+
+    async def _fetch(self, url: str) -> str:
+        async with self.client.stream("GET", url) as response:
+            response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= settings.detail_max_bytes:
+                    break
+            return bytes(body[:settings.detail_max_bytes]).decode(response.encoding or "utf-8", errors="replace")
+
+    async def aclose(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self.reset_client()
+
+
+# Singleton
+job_detail = JobDetailService()
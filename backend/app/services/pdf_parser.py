@@ -1,8 +1,9 @@
 """PDF parsing service"""
 
+import asyncio
 import logging
 import fitz  # PyMuPDF
-from io import BytesIO
+from typing import Union
 
 logger = logging.getLogger(__name__)
 
@@ -11,41 +12,48 @@ class PDFParser:
     """Extract text from PDF files"""
     
     @staticmethod
-    async def extract_text(file_content: bytes) -> str:
-        """Extract text from PDF bytes"""
+    def _open(source: Union[bytes, str]) -> fitz.Document:
+        # A path lets MuPDF read pages from disk instead of a copied buffer
+        if isinstance(source, str):
+            return fitz.open(source, filetype="pdf")
+        return fitz.open(stream=source, filetype="pdf")
+    
+    @staticmethod
+    def _extract_pages(source: Union[bytes, str]) -> str:
+        with PDFParser._open(source) as doc:
+            return "\n".join(page.get_text("text") for page in doc)
+    
+    @staticmethod
+    def clean_whitespace(text: str) -> str:
+        """Collapse runs of spaces and trim"""
+        while "  " in text:
+            text = text.replace("  ", " ")
+        return text.strip()
+    
+    @staticmethod
+    async def extract_text(source: Union[bytes, str]) -> str:
+        """Extract text from PDF bytes or a PDF file path"""
         logger.info("📄 Extracting text from PDF...")
         
         try:
-            pdf_stream = BytesIO(file_content)
-            doc = fitz.open(stream=pdf_stream, filetype="pdf")
-            
-            text_content = []
-            for page in doc:
-                text_content.append(page.get_text("text"))
-            
-            doc.close()
-            
-            full_text = "\n".join(text_content)
+            # MuPDF is CPU-bound: keep it off the event loop
+            loop = asyncio.get_event_loop()
+            full_text = await loop.run_in_executor(None, PDFParser._extract_pages, source)
             
-            # Clean up
-            while "  " in full_text:
-                full_text = full_text.replace("  ", " ")
+            full_text = PDFParser.clean_whitespace(full_text)
             
             logger.info(f"✅ Extracted {len(full_text)} characters")
-            return full_text.strip()
+            return full_text
             
         except Exception as e:
             logger.error(f"❌ PDF extraction failed: {e}")
             raise ValueError(f"Failed to parse PDF: {str(e)}")
     
     @staticmethod
-    def validate_pdf(file_content: bytes) -> bool:
-        """Check if content is valid PDF"""
+    def validate_pdf(source: Union[bytes, str]) -> bool:
+        """Check if content (bytes or file path) is valid PDF"""
         try:
-            pdf_stream = BytesIO(file_content)
-            doc = fitz.open(stream=pdf_stream, filetype="pdf")
-            is_valid = len(doc) > 0
-            doc.close()
-            return is_valid
+            with PDFParser._open(source) as doc:
+                return len(doc) > 0
         except:
             return False
\ No newline at end of file
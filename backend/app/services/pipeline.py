@@ -0,0 +1,69 @@
+"""Tiny async dependency graph for request pipelines"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StageGraph:
+    """
+    Named async stages with dependencies.
+
+    Every stage starts as soon as its dependencies finish, so independent
+    stages overlap. A stage function receives its dependencies' results as
+    positional arguments. Per-stage wall time is recorded in `timings_ms`.
+
+        graph = StageGraph()
+        graph.add("profile", fetch_profile)
+        graph.add("query", make_query, "profile")
+        results = await graph.run("query")
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = time.perf_counter()
+        self.timings_ms: Dict[str, float] = {}
+
+    def add(self, name: str, fn: Callable[..., Awaitable[Any]], *deps: str) -> "StageGraph":
+        self._stages[name] = (fn, deps)
+        return self
+
+    def task(self, name: str) -> asyncio.Task:
+        """The running task for a stage (started on first request)"""
+        if name not in self._tasks:
+            fn, deps = self._stages[name]
+            self._tasks[name] = asyncio.create_task(self._run_stage(name, fn, deps))
+        return self._tasks[name]
+
+    async def _run_stage(self, name: str, fn, deps: Tuple[str, ...]) -> Any:
+        args = await asyncio.gather(*(self.task(dep) for dep in deps))
+        start = time.perf_counter()
+        try:
+            return await fn(*args)
+        finally:
+            self.timings_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def start(self) -> None:
+        """Kick off every stage so nothing waits on a caller to ask for it"""
+        for name in self._stages:
+            self.task(name)
+
+    async def run(self, *targets: str) -> Dict[str, Any]:
+        self.start()
+        values = await asyncio.gather(*(self.task(t) for t in targets))
+        return dict(zip(targets, values))
+
+    def cancel(self, names: Iterable[str] = ()) -> None:
+        """Cancel the given (or all) unfinished stages"""
+        for name in names or list(self._tasks):
+            task = self._tasks.get(name)
+            if task and not task.done():
+                task.cancel()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
@@ -0,0 +1,283 @@
+"""Native async PostgREST access (pooled httpx client, no executor hop)"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.config import settings
+from app.services.fork_safe import ForkSafeClient
+from app.services.compression import compress_text
+from app.services.rollups import query_deltas
+
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:  # pragma: no cover - HTTP/1.1 keep-alive still pools
+    HTTP2 = False
+
+logger = logging.getLogger(__name__)
+
+
+class PostgrestError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+def in_list(values: Sequence[Any]) -> str:
+    """PostgREST `in.(...)` filter with every value quoted"""
+    quoted = ('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return f"in.({','.join(quoted)})"
+
+
+class PostgrestAsync(ForkSafeClient):
+    """
+    Thin async PostgREST client.
+
+    One httpx.AsyncClient (HTTP/2 when `h2` is installed, keep-alive
+    either way) is shared by every request in the worker; httpx pools are
+    safe to use from concurrent tasks on the same loop.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, key: Optional[str] = None):
+        self.base_url = (base_url or f"{settings.supabase_url}/rest/v1").rstrip("/")
+        self.key = key or settings.supabase_key
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2,
+            timeout=settings.postgrest_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.postgrest_pool_size,
+                max_keepalive_connections=settings.postgrest_pool_size
+            ),
+            headers={"apikey": self.key, "Authorization": f"Bearer {self.key}"}
+        )
+
+    async def request(self, method: str, table: str, params: Optional[Dict[str, str]] = None,
+                      json: Any = None, prefer: Optional[str] = None) -> List[Dict]:
+        headers = {"Prefer": prefer} if prefer else None
+        response = await self.client.request(method, f"/{table}", params=params, json=json, headers=headers)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise PostgrestError(response.status_code, message)
+        if not response.content:
+            return []
+        data = response.json()
+        return data if isinstance(data, list) else [data]
+
+    async def select(self, table: str, columns: str = "*", order: Optional[str] = None,
+                     limit: Optional[int] = None, **filters: str) -> List[Dict]:
+        """filters are PostgREST operators, e.g. email="eq.a@b.com" """
+        params = {"select": columns, **filters}
+        if order:
+            params["order"] = order
+        if limit:
+            params["limit"] = str(limit)
+        return await self.request("GET", table, params)
+
+    async def insert(self, table: str, rows: Any, on_conflict: Optional[str] = None) -> List[Dict]:
+        prefer = "return=representation"
+        params = None
+        if on_conflict:
+            prefer += ",resolution=merge-duplicates"
+            params = {"on_conflict": on_conflict}
+        return await self.request("POST", table, params, rows, prefer)
+
+    async def update(self, table: str, values: Dict, **filters: str) -> List[Dict]:
+        return await self.request("PATCH", table, filters, values, "return=representation")
+
+    async def delete(self, table: str, **filters: str) -> List[Dict]:
+        return await self.request("DELETE", table, filters)
+
+    async def rpc(self, fn: str, args: Dict) -> List[Dict]:
+        return await self.request("POST", f"rpc/{fn}", json=args)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self.reset_client()
+
+
+class AsyncSupabaseService:
+    """
+    Async versions of the hot SupabaseService operations.
+
+    Shares the owning service's near-duplicate index and insert listeners,
+    so both paths keep the same in-process state.
+    """
+
+    def __init__(self, owner, rest: Optional[PostgrestAsync] = None):
+        self.owner = owner
+        self.rest = rest or PostgrestAsync()
+
+    async def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        email = profile_data.get("email")
+        logger.info(f"💾 Saving profile: {email}")
+        data = {
+            "full_name": profile_data.get("full_name"),
+            "email": email,
+            "phone": profile_data.get("phone", ""),
+            "location": profile_data.get("location", ""),
+            "skills": profile_data.get("skills", []),
+            "experience_summary": profile_data.get("experience_summary", ""),
+            "cv_text": "",
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        # CV first: the row only drops its inline cv_text once the compressed
+        # copy is stored (a failure here aborts the save)
+        await self._save_cv_text(email, profile_data.get("cv_text", ""), profile_data.get("content_sha256"))
+        await self._clear_profile_results(email)
+        existing = await self.rest.select("profiles", "id", email=f"eq.{email}")
+        try:
+            result = await self._write_profile(data, bool(existing))
+        except PostgrestError as e:
+            # If location column is missing, try saving without it
+            if "column" not in e.message.lower():
+                logger.error(f"❌ Failed to save profile: {e}")
+                raise
+            logger.warning("⚠️ 'location' column missing in Supabase. Falling back...")
+            del data["location"]
+            result = await self._write_profile(data, bool(existing))
+
+        logger.info("✅ Profile saved")
+        return result[0] if result else None
+
+    async def _write_profile(self, data: Dict, exists: bool) -> List[Dict]:
+        if exists:
+            return await self.rest.update("profiles", data, email=f"eq.{data['email']}")
+        return await self.rest.insert("profiles", {**data, "created_at": datetime.utcnow().isoformat()})
+
+    async def _save_cv_text(self, email: str, cv_text: str, content_sha256: Optional[str] = None) -> None:
+        if not email or not cv_text:
+            return
+        try:
+            await self.rest.insert("profile_documents", {
+                "email": email,
+                "cv_text_z": compress_text(cv_text),
+                "cv_chars": len(cv_text),
+                "content_sha256": content_sha256,
+                "updated_at": datetime.utcnow().isoformat()
+            }, on_conflict="email")
+        except Exception as e:
+            logger.error(f"❌ Failed to save CV text for {email}: {e}")
+            raise
+
+    async def _clear_profile_results(self, email: str) -> None:
+        try:
+            await self.rest.delete("profile_results", email=f"eq.{email}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to clear saved results for {email}: {e}")
+
+    async def get_profile_by_email(self, email: str, columns: str) -> Optional[Dict]:
+        try:
+            rows = await self.rest.select("profiles", columns, email=f"eq.{email}")
+        except PostgrestError as e:
+            if columns == "*" or "column" not in e.message.lower():
+                logger.error(f"❌ Failed to fetch profile: {e}")
+                return None
+            logger.warning(f"⚠️ Profile projection failed ({e}), falling back to *")
+            rows = await self.rest.select("profiles", "*", email=f"eq.{email}")
+            for row in rows:
+                row.pop("cv_text", None)
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch profile: {e}")
+            return None
+        return rows[0] if rows else None
+
+    async def get_recent_jobs(self, limit: int = 100) -> List[Dict]:
+        try:
+            return await self.rest.select("jobs", "*", order="created_at.desc", limit=limit)
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch jobs: {e}")
+            return []
+
+    async def store_jobs(self, jobs: List[Dict], search_query: str, counted_query: Optional[str] = None) -> int:
+        """SupabaseService.store_jobs over async PostgREST (same planning, see _plan_store)"""
+        owner = self.owner
+        logger.info(f"💾 Storing {len(jobs)} jobs...")
+        # Planning hashes every posting (MinHash); keep it off the event loop
+        loop = asyncio.get_event_loop()
+        incoming = await loop.run_in_executor(None, owner._incoming_jobs, jobs)
+        if not incoming:
+            if counted_query:
+                await self._bump_rollups(query_deltas(counted_query))
+            return 0
+
+        try:
+            existing = await self.rest.select("jobs", "id,url,content_hash", url=in_list(list(incoming)))
+            known = {row["url"]: row for row in existing}
+        except Exception as e:
+            logger.warning(f"⚠️ Duplicate check failed: {e}")
+            known = {}
+        plan = await loop.run_in_executor(None, owner._plan_store, incoming, known, search_query)
+
+        changed = 0
+        for job_id, row in plan.updates:
+            try:
+                await self.rest.update("jobs", row, id=f"eq.{job_id}")
+                changed += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to update job: {e}")
+        merged = 0
+        for match, urls, row, sig in plan.merges:
+            added = await self._add_alternate_urls(match, urls)
+            merged += owner._merged_or_requeue(plan, added, match, row, sig)
+
+        inserted = []
+        if plan.new_rows:
+            try:
+                inserted = await self.rest.insert("jobs", [row for row, _ in plan.new_rows])
+            except Exception as e:
+                logger.warning(f"⚠️ Batch insert failed ({e}), retrying row by row")
+                inserted = []
+                for row, _ in plan.new_rows:
+                    try:
+                        inserted.extend(await self.rest.insert("jobs", row))
+                    except Exception as row_e:
+                        logger.warning(f"⚠️ Failed to store job: {row_e}")
+
+        await self._bump_rollups(owner._stored_deltas(plan, inserted, counted_query))
+        if inserted:
+            # Listeners (embedding index: numpy, file lock, memmap) block
+            await loop.run_in_executor(None, owner._notify_inserted, inserted)
+        logger.info(f"✅ Stored {len(inserted)} new jobs, updated {changed}, merged {merged} duplicates")
+        return len(inserted)
+
+    async def _add_alternate_urls(self, job_id: str, urls: List[str]) -> Optional[int]:
+        try:
+            rows = await self.rest.select("jobs", "url,alternate_urls", id=f"eq.{job_id}")
+            if not rows:
+                return None
+            primary = rows[0]
+            alternates = list(primary.get("alternate_urls") or [])
+            added = [u for u in urls if u and u != primary.get("url") and u not in alternates]
+            if added:
+                await self.rest.update("jobs", {"alternate_urls": alternates + added}, id=f"eq.{job_id}")
+            return len(added)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to merge duplicate into {job_id}: {e}")
+            return 0
+
+    async def _bump_rollups(self, deltas: Dict) -> None:
+        payload = [
+            {"dimension": dimension, "key": key, "count": count}
+            for (dimension, key), count in deltas.items() if count
+        ]
+        if not payload:
+            return
+        try:
+            await self.rest.rpc("bump_job_rollups", {"deltas": payload})
+        except Exception as e:
+            logger.warning(f"⚠️ Rollup update failed: {e}")
+
+    async def aclose(self) -> None:
+        await self.rest.aclose()
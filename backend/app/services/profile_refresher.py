@@ -0,0 +1,127 @@
+"""Background refresh of saved profiles' job results"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+from app.config import settings
+from app.services.cerebras_client import cerebras_client
+from app.services.tavily_client import tavily_client
+from app.services.supabase_service import supabase_service
+from app.services.ranking import rank_jobs
+from app.services.dedup import collapse_in_executor
+from app.services.background import SingleWorkerLoop
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileRefresher(SingleWorkerLoop):
+    """
+    Periodically re-runs the generated search for every profile.
+
+    New or changed postings go through store_jobs (content hash on the
+    canonical URL), and the ranked list is saved to `profile_results` so
+    /search can answer a known email without a live crawl. Freshly
+    onboarded profiles get the same treatment right away via `prefetch`.
+    """
+
+    tag = "REFRESH"
+
+    def __init__(self):
+        super().__init__()
+        self._prefetch: Dict[str, asyncio.Task] = {}
+        self._prefetch_running: Set[str] = set()
+        self._prefetch_slots: Optional[asyncio.Semaphore] = None
+
+    async def refresh_profile(self, profile: Dict) -> int:
+        """Refresh one profile, return number of new postings stored"""
+        email = profile.get("email")
+        location = profile.get("location") or ""
+
+        query = await cerebras_client.generate_search_query(
+            skills=profile.get("skills") or [],
+            experience=profile.get("experience_summary") or "",
+            location=location
+        )
+        jobs = await tavily_client.search_jobs(query)
+        stored = await supabase_service.store_jobs(jobs, query) if jobs else 0
+
+        ranked = await collapse_in_executor(rank_jobs(jobs, location), settings.dedup_threshold)
+        await supabase_service.save_profile_results(email, query, ranked)
+        logger.info(f"[REFRESH] {email}: {len(jobs)} results, {stored} new")
+        return stored
+
+    async def refresh_all(self) -> int:
+        """Refresh every profile under the concurrency budget"""
+        profiles = await supabase_service.list_profiles()
+        semaphore = asyncio.Semaphore(max(1, settings.refresh_concurrency))
+
+        async def _run(profile: Dict) -> int:
+            async with semaphore:
+                try:
+                    return await self.refresh_profile(profile)
+                except Exception as e:
+                    logger.warning(f"[REFRESH] {profile.get('email')} failed: {e}")
+                    return 0
+
+        results = await asyncio.gather(*(_run(p) for p in profiles if p.get("email")))
+        total = sum(results)
+        logger.info(f"[REFRESH] Pass done: {len(results)} profiles, {total} new jobs")
+        return total
+
+    def prefetch(self, profile: Dict) -> bool:
+        """Refresh a just-onboarded profile in the background; False if not scheduled"""
+        email = profile.get("email")
+        if settings.prefetch_concurrency <= 0 or not email or email in self._prefetch:
+            return False
+        if len(self._prefetch) >= settings.prefetch_max_pending:
+            logger.info(f"[PREFETCH] Budget full, skipping {email}")
+            return False
+        if self._prefetch_slots is None:
+            self._prefetch_slots = asyncio.Semaphore(settings.prefetch_concurrency)
+        task = asyncio.create_task(self._run_prefetch(profile))
+        self._prefetch[email] = task
+        task.add_done_callback(lambda _: self._prefetch.pop(email, None))
+        return True
+
+    async def _run_prefetch(self, profile: Dict) -> None:
+        email = profile["email"]
+        async with self._prefetch_slots:
+            self._prefetch_running.add(email)
+            try:
+                await self.refresh_profile(profile)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[PREFETCH] {email} failed: {e}")
+            finally:
+                self._prefetch_running.discard(email)
+
+    async def join_prefetch(self, email: str) -> None:
+        """Wait for an in-flight prefetch of this email (not one still queued)"""
+        task = self._prefetch.get(email)
+        if task and email in self._prefetch_running:
+            logger.info(f"[PREFETCH] Joining in-flight prefetch for {email}")
+            await asyncio.wait({task})
+
+    async def run_pass(self) -> None:
+        await self.refresh_all()
+
+    def start(self) -> None:
+        if settings.refresh_interval_minutes <= 0:
+            return
+        if self.start_loop(settings.refresh_lock_file, settings.refresh_interval_minutes * 60):
+            logger.info(f"[REFRESH] Every {settings.refresh_interval_minutes} min, "
+                        f"concurrency {settings.refresh_concurrency}")
+
+    async def stop(self) -> None:
+        prefetching = list(self._prefetch.values())
+        for task in prefetching:
+            task.cancel()
+        if prefetching:
+            await asyncio.gather(*prefetching, return_exceptions=True)
+            logger.info(f"[PREFETCH] Cancelled {len(prefetching)} pending prefetches")
+        await self.stop_loop()
+
+
+# Singleton
+profile_refresher = ProfileRefresher()
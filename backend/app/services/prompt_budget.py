@@ -0,0 +1,100 @@
+"""Token counting and budget-fitting for LLM prompts"""
+
+import re
+from typing import Iterable, List, Sequence
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - optional; fall back to ~4 chars per token
+    _ENCODING = None
+
+_WORD_RE = re.compile(r"[a-z0-9+#]{3,}")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# A CV section starts after a blank line or at a short all-caps heading
+_SECTION_RE = re.compile(r"\n\s*\n|\n(?=[A-Z][A-Z &/]{2,40}\n)")
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in `text` (tiktoken cl100k when installed, else chars / 4)"""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return max(1, (len(text) + 3) // 4)
+
+
+def _terms(texts: Iterable[str]) -> set:
+    return {w for t in texts for w in _WORD_RE.findall((t or "").lower())}
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Cut `text` to at most `budget` tokens on a word boundary"""
+    if count_tokens(text) <= budget:
+        return text
+    if _ENCODING is not None:
+        cut = _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:budget])
+    else:
+        cut = text[:budget * 4]
+    return cut.rsplit(" ", 1)[0] if " " in cut else cut
+
+
+def fit_chunks(chunks: Sequence[str], budget: int, relevant: Iterable[str] = (),
+               keep_first: bool = False, joiner: str = "\n") -> str:
+    """
+    Most relevant chunks that fit in `budget` tokens, in original order.
+
+    Relevance is overlap with the `relevant` words, with a small bonus for
+    earlier chunks; ties go to the earlier chunk.
+    """
+    chunks = [c.strip() for c in chunks if c and c.strip()]
+    if not chunks or budget <= 0:
+        return ""
+    wanted = _terms(relevant)
+    sizes = [count_tokens(c) for c in chunks]
+    if sum(sizes) <= budget:
+        return joiner.join(chunks)
+
+    def score(i: int) -> float:
+        words = _terms([chunks[i]])
+        overlap = len(words & wanted) / (1 + len(words)) ** 0.5 if wanted else 0.0
+        return overlap + 0.1 / (1 + i)
+
+    order = sorted(range(len(chunks)), key=lambda i: (-score(i), i))
+    if keep_first:
+        order.remove(0)
+        order.insert(0, 0)
+    picked, used = [], 0
+    for i in order:
+        if used + sizes[i] <= budget:
+            picked.append(i)
+            used += sizes[i]
+        elif not picked:
+            # Nothing fits yet: take a truncated piece of the best chunk
+            return _truncate(chunks[i], budget)
+    return joiner.join(chunks[i] for i in sorted(picked))
+
+
+def fit_sections(text: str, budget: int, relevant: Iterable[str] = ()) -> str:
+    """CV-style text: keep the header section, then the most relevant sections"""
+    return fit_chunks(_SECTION_RE.split(text or ""), budget, relevant, keep_first=True, joiner="\n\n")
+
+
+def fit_sentences(text: str, budget: int, relevant: Iterable[str] = ()) -> str:
+    """Prose: the most relevant sentences within the budget"""
+    return fit_chunks(_SENTENCE_RE.split(text or ""), budget, relevant, joiner=" ")
+
+
+def fit_items(items: Sequence[str], budget: int, relevant: Iterable[str] = (), sep: str = ", ") -> str:
+    """A list (e.g. skills): relevant items first, as many as fit"""
+    wanted = _terms(relevant)
+    ranked = sorted(items or [], key=lambda item: not (_terms([item]) & wanted))
+    picked: List[str] = []
+    used = 0
+    for item in ranked:
+        cost = count_tokens(item + sep)
+        if used + cost > budget:
+            break
+        picked.append(item)
+        used += cost
+    return sep.join(picked)
@@ -0,0 +1,28 @@
+"""Job ranking helpers"""
+
+from typing import List, Dict
+
+
+def location_score(job: Dict, user_location: str) -> int:
+    """Score a job by how well its location matches the user's (lowercased)"""
+    job_loc = (job.get("location") or "").lower()
+    if not user_location or not job_loc:
+        return 0
+    # If user location is in job location or vice versa
+    if user_location in job_loc or job_loc in user_location:
+        return 10
+    return 0
+
+
+def rank_jobs(jobs: List[Dict], user_location: str = "") -> List[Dict]:
+    """Sort jobs so location matches come first (stable for ties)"""
+    user_location = (user_location or "").lower()
+    if not user_location:
+        return list(jobs)
+    return sorted(jobs, key=lambda job: location_score(job, user_location), reverse=True)
+
+
+def result_quality(jobs: List[Dict], user_location: str = "") -> float:
+    """Rough usefulness of a result set: one point per job, more for local ones"""
+    user_location = (user_location or "").lower()
+    return sum(1 + location_score(job, user_location) / 10 for job in jobs)
@@ -0,0 +1,97 @@
+"""Scheduled retention for the jobs table: archive to disk, then delete"""
+
+import os
+import gzip
+import json
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.services.supabase_service import supabase_service
+from app.services.background import SingleWorkerLoop
+
+logger = logging.getLogger(__name__)
+
+
+class JobRetention(SingleWorkerLoop):
+    """
+    Keeps the hot `jobs` table small.
+
+    Postings older than `retention_days` are read in bounded batches,
+    appended to a gzipped NDJSON archive (one file per run under
+    `retention_archive_dir`) and only then deleted, so history stays
+    queryable offline:
+
+        zcat data/archive/jobs-*.ndjson.gz | jq .title
+        pandas.read_json(path, lines=True)
+    """
+
+    tag = "RETENTION"
+
+    async def run_once(self, days: Optional[int] = None, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """One retention pass; returns rows, bytes and duration"""
+        days = settings.retention_days if days is None else days
+        batch_size = batch_size or settings.retention_batch_size
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        cutoff = (now - timedelta(days=days)).isoformat()
+
+        os.makedirs(settings.retention_archive_dir, exist_ok=True)
+        path = os.path.join(settings.retention_archive_dir, f"jobs-{now:%Y%m%d-%H%M%S}.ndjson.gz")
+        rows = 0
+        raw_bytes = 0
+
+        with gzip.open(path, "ab") as archive:
+            while True:
+                batch = await supabase_service.get_expired_jobs(cutoff, batch_size)
+                if not batch:
+                    break
+                lines = b"".join(
+                    json.dumps(row, ensure_ascii=False, default=str).encode() + b"\n" for row in batch
+                )
+                archive.write(lines)
+                archive.flush()  # on disk before anything is deleted
+                deleted = await supabase_service.delete_jobs(batch)
+                rows += deleted
+                raw_bytes += len(lines)
+                if deleted < len(batch):
+                    # Nothing (or only part) went away: don't spin on the same rows
+                    logger.warning(f"[RETENTION] Deleted {deleted}/{len(batch)} rows, stopping this pass")
+                    break
+                if len(batch) < batch_size:
+                    break
+
+        archived_bytes = os.path.getsize(path)
+        if rows == 0:
+            os.remove(path)
+            path = None
+        report = {
+            "cutoff": cutoff,
+            "rows": rows,
+            "reclaimed_bytes": raw_bytes,  # row payload size; Postgres frees it on vacuum
+            "archived_bytes": archived_bytes if path else 0,
+            "archive": path,
+            "duration_s": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"[RETENTION] {rows} jobs older than {days} days archived and deleted, "
+                    f"~{raw_bytes / 1024:.0f} KB reclaimed, {report['archived_bytes'] / 1024:.0f} KB "
+                    f"archive, {report['duration_s']}s")
+        return report
+
+    async def run_pass(self) -> None:
+        await self.run_once()
+
+    def start(self) -> None:
+        if settings.retention_days <= 0 or settings.retention_interval_minutes <= 0:
+            return
+        if self.start_loop(settings.retention_lock_file, settings.retention_interval_minutes * 60):
+            logger.info(f"[RETENTION] Keeping {settings.retention_days} days, "
+                        f"checking every {settings.retention_interval_minutes} min")
+
+    async def stop(self) -> None:
+        await self.stop_loop()
+
+
+# Singleton
+job_retention = JobRetention()
@@ -0,0 +1,103 @@
+"""Incremental job rollups: (dimension, key) -> count deltas per stored batch"""
+
+import re
+from collections import Counter
+from itertools import permutations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Plain counts over every stored job ("day" is the UTC created_at date)
+DIMENSIONS = ("company", "location", "source", "day", "term")
+# How often each query was searched through /search (one per search, not per
+# job); background profile refreshes store jobs without counting here
+QUERY_DIMENSION = "query"
+# Write counter for the jobs table, bumped by a database trigger on every
+# insert, update and delete (schema.sql); GET /jobs uses it as its ETag version
+VERSION_DIMENSION = "version"
+VERSION_KEY = "jobs"
+# Counts keyed "<term>|<value>", so one prefix lookup answers "for jobs with
+# this title word, which companies / locations / sources / other words?"
+TERM_DIMENSIONS = ("term_company", "term_location", "term_source", "term_term")
+
+TITLE_STOPWORDS = {
+    "and", "for", "the", "with", "job", "jobs", "hiring", "role", "new", "from",
+    "linkedin", "indeed", "glassdoor", "rozee", "via", "full", "time", "part",
+}
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#]{2,}")
+# Resume-mode searches (and the rows they store) are keyed by the user's email
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+MAX_TITLE_TERMS = 6
+
+RollupKey = Tuple[str, str]
+
+
+def title_terms(text: str) -> List[str]:
+    """Distinct, lowercased title words worth aggregating on (order kept)"""
+    seen: Dict[str, None] = {}
+    for word in _WORD_RE.findall((text or "").lower()):
+        if word not in TITLE_STOPWORDS:
+            seen[word] = None
+    return list(seen)[:MAX_TITLE_TERMS]
+
+
+def _value(row: Dict, field: str) -> str:
+    return (row.get(field) or "").strip()[:100]
+
+
+def rollup_deltas(rows: Iterable[Dict], sign: int = 1) -> Counter:
+    """
+    Count deltas for a batch of job rows (sign=-1 when rows are removed).
+
+    Cost is per row and independent of table size, so store_jobs can apply
+    it on every insert.
+    """
+    deltas: Counter = Counter()
+    for row in rows:
+        values = {
+            "company": _value(row, "company"),
+            "location": _value(row, "location"),
+            "source": _value(row, "source") or "tavily",
+        }
+        for dimension, value in values.items():
+            if value:
+                deltas[(dimension, value)] += sign
+        day = (row.get("created_at") or "")[:10]
+        if day:
+            deltas[("day", day)] += sign
+        terms = title_terms(row.get("title"))
+        for term in terms:
+            deltas[("term", term)] += sign
+            for dimension, value in values.items():
+                if value:
+                    deltas[(f"term_{dimension}", f"{term}|{value}")] += sign
+        for term, other in permutations(terms, 2):
+            deltas[("term_term", f"{term}|{other}")] += sign
+    return deltas
+
+
+def query_deltas(search_query: Optional[str]) -> Counter:
+    """One search's contribution to the query-frequency rollup (never an email: /jobs/stats is public)"""
+    query = " ".join((search_query or "").lower().split())[:200]
+    if not query or _EMAIL_RE.search(query):
+        return Counter()
+    return Counter({(QUERY_DIMENSION, query): 1})
+
+
+def summarize_terms(rows: Iterable[Dict], terms: List[str], top: int = 5) -> Dict:
+    """Fold term rollup rows into top companies / locations / sources / related words"""
+    term_counts: Dict[str, int] = {}
+    buckets = {dimension: Counter() for dimension in TERM_DIMENSIONS}
+    for row in rows:
+        if row["dimension"] == "term" and row["key"] in terms:
+            term_counts[row["key"]] = row["count"]
+        elif row["dimension"] in buckets:
+            term, _, value = row["key"].partition("|")
+            if term not in terms or (row["dimension"] == "term_term" and value in terms):
+                continue
+            buckets[row["dimension"]][value] += row["count"]
+    return {
+        "terms": {term: term_counts.get(term, 0) for term in terms},
+        "companies": buckets["term_company"].most_common(top),
+        "locations": buckets["term_location"].most_common(top),
+        "sources": buckets["term_source"].most_common(top),
+        "related_terms": buckets["term_term"].most_common(top),
+    }
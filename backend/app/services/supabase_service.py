@@ -1,28 +1,76 @@
 """Supabase database operations"""
 
+import re
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from app.database import supabase
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from datetime import datetime, timedelta
+from collections import Counter
+from dataclasses import dataclass, field
+from app.database import supabase, get_supabase_client
+from app.services.fork_safe import ForkSafeClient
+from app.services.fingerprint import canonical_url, content_hash
+from app.services.dedup import NearDuplicateIndex, collapse, signature, minhash, shingles
+from app.services.compression import compress_text, decompress_text
+from app.services.rollups import (
+    rollup_deltas, query_deltas, TERM_DIMENSIONS, VERSION_DIMENSION, VERSION_KEY
+)
+from app.services.postgrest_async import AsyncSupabaseService
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# What search, cover letters and onboarding read; cv_text is never on the hot path
+PROFILE_COLUMNS = "id,full_name,email,phone,location,skills,experience_summary,created_at"
 
-class SupabaseService:
+# How far each dedup index refresh reaches back past the previous one
+DEDUP_REFRESH_OVERLAP = timedelta(minutes=2)
+
+# Words that say nothing about which stored job matches
+FALLBACK_STOPWORDS = {"and", "for", "the", "jobs", "job", "with", "remote", "hiring", "role", "roles"}
+
+
+@dataclass
+class StorePlan:
+    """What store_jobs will write for one batch"""
+    new_rows: List[Tuple[Dict, Any]] = field(default_factory=list)  # (row, minhash signature)
+    updates: List[Tuple[str, Dict]] = field(default_factory=list)  # (job id, changed row)
+    merges: List[Tuple[str, List[str], Dict, Any]] = field(default_factory=list)  # (stored duplicate id, urls, row, signature)
+
+
+class SupabaseService(ForkSafeClient):
     """Database operations for profiles and jobs"""
     
     def __init__(self):
         self.client = supabase
+        self.dedup_index = NearDuplicateIndex(settings.dedup_threshold, settings.dedup_max_jobs)
+        # created_at lower bound for the next refresh_dedup_index (None: load everything)
+        self._dedup_since: Optional[str] = None
+        self._insert_listeners: List[Callable[[List[Dict]], None]] = []
+        self._delete_listeners: List[Callable[[List[Dict]], None]] = []
+        # Optional native async path for the hot operations
+        self.rest = AsyncSupabaseService(self) if settings.postgrest_async else None
+    
+    def _create_client(self):
+        return get_supabase_client()
     
     async def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update user profile"""
+        if self.rest:
+            return await self.rest.create_profile(profile_data)
+        
         def _sync_create():
             logger.info(f"💾 Saving profile: {profile_data.get('email')}")
+            # CV first: the row below only drops its inline cv_text once the
+            # compressed copy is stored (a failure here aborts the save)
+            self._save_cv_text(profile_data.get("email"), profile_data.get("cv_text", ""),
+                               profile_data.get("content_sha256"))
+            # Results saved for the old CV would otherwise be served until the next refresh
+            self._clear_profile_results(profile_data.get("email"))
             
             try:
                 # Check existing
-                existing = self.client.table("profiles").select("*").eq(
+                existing = self.client.table("profiles").select("id").eq(
                     "email", profile_data.get("email")
                 ).execute()
                 
@@ -33,7 +81,8 @@ class SupabaseService:
                     "location": profile_data.get("location", ""),
                     "skills": profile_data.get("skills", []),
                     "experience_summary": profile_data.get("experience_summary", ""),
-                    "cv_text": profile_data.get("cv_text", ""),
+                    # Full CV lives compressed in profile_documents
+                    "cv_text": "",
                     "updated_at": datetime.utcnow().isoformat()
                 }
                 
@@ -72,63 +121,318 @@ class SupabaseService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _sync_create)
     
-    async def get_profile_by_email(self, email: str) -> Optional[Dict]:
-        """Get profile by email"""
+    def _save_cv_text(self, email: str, cv_text: str, content_sha256: Optional[str] = None) -> None:
+        """Store the compressed CV; raises so the caller never blanks the inline copy on failure"""
+        if not email or not cv_text:
+            return
+        try:
+            self.client.table("profile_documents").upsert({
+                "email": email,
+                "cv_text_z": compress_text(cv_text),
+                "cv_chars": len(cv_text),
+                "content_sha256": content_sha256,
+                "updated_at": datetime.utcnow().isoformat()
+            }, on_conflict="email").execute()
+        except Exception as e:
+            logger.error(f"❌ Failed to save CV text for {email}: {e}")
+            raise
+    
+    async def get_profile_by_content_hash(self, content_sha256: str) -> Optional[Dict]:
+        """Profile already built from an upload with these exact bytes"""
+        def _sync_lookup():
+            try:
+                result = self.client.table("profile_documents").select("email").eq(
+                    "content_sha256", content_sha256
+                ).order("updated_at", desc=True).limit(1).execute()
+                return result.data[0]["email"] if result.data else None
+            except Exception as e:
+                logger.warning(f"⚠️ Content hash lookup failed: {e}")
+                return None
+
+        loop = asyncio.get_event_loop()
+        email = await loop.run_in_executor(None, _sync_lookup)
+        return await self.get_profile_by_email(email) if email else None
+    
+    async def get_profile_by_email(self, email: str, columns: str = PROFILE_COLUMNS) -> Optional[Dict]:
+        """Get profile by email (without cv_text; see get_cv_text)"""
+        if self.rest:
+            return await self.rest.get_profile_by_email(email, columns)
+        
         def _sync_get_profile():
             try:
-                result = self.client.table("profiles").select("*").eq(
+                result = self.client.table("profiles").select(columns).eq(
                     "email", email
                 ).execute()
                 return result.data[0] if result.data else None
             except Exception as e:
+                # Older tables may lack a projected column (e.g. location)
+                if columns != "*" and "column" in str(e).lower():
+                    logger.warning(f"⚠️ Profile projection failed ({e}), falling back to *")
+                    try:
+                        result = self.client.table("profiles").select("*").eq("email", email).execute()
+                        if result.data:
+                            result.data[0].pop("cv_text", None)
+                            return result.data[0]
+                        return None
+                    except Exception as fallback_e:
+                        e = fallback_e
                 logger.error(f"❌ Failed to fetch profile: {e}")
                 return None
 
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _sync_get_profile)
     
-    async def store_jobs(self, jobs: List[Dict], search_query: str) -> int:
-        """Store jobs (skip duplicates)"""
+    async def get_cv_text(self, email: str) -> str:
+        """Full CV text, loaded only by the code paths that need it"""
+        def _sync_get_cv():
+            try:
+                result = self.client.table("profile_documents").select("cv_text_z").eq(
+                    "email", email
+                ).execute()
+                if result.data:
+                    return decompress_text(result.data[0]["cv_text_z"])
+                # Profiles saved before the split still carry it inline
+                legacy = self.client.table("profiles").select("cv_text").eq("email", email).execute()
+                return (legacy.data[0].get("cv_text") or "") if legacy.data else ""
+            except Exception as e:
+                logger.error(f"❌ Failed to fetch CV text: {e}")
+                return ""
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_get_cv)
+    
+    async def store_jobs(self, jobs: List[Dict], search_query: str, counted_query: Optional[str] = None) -> int:
+        """
+        Store new jobs and refresh changed ones (keyed by canonical URL).
+        counted_query: the search to count in the query rollup (public via
+        /jobs/stats). Only the /search handler passes it, never an email,
+        so background refreshes don't inflate it.
+        """
+        if self.rest:
+            return await self.rest.store_jobs(jobs, search_query, counted_query)
+        
         def _sync_store():
             logger.info(f"💾 Storing {len(jobs)} jobs...")
+            incoming = self._incoming_jobs(jobs)
+            if not incoming:
+                if counted_query:
+                    self._bump_rollups(query_deltas(counted_query))
+                return 0
+            
+            try:
+                existing = self.client.table("jobs").select("id,url,content_hash").in_(
+                    "url", list(incoming)
+                ).execute()
+                known = {row["url"]: row for row in existing.data or []}
+            except Exception as e:
+                logger.warning(f"⚠️ Duplicate check failed: {e}")
+                known = {}
+            plan = self._plan_store(incoming, known, search_query)
             
-            stored = 0
-            for job in jobs:
+            changed = 0
+            for job_id, row in plan.updates:
                 try:
-                    # Check duplicate
-                    existing = self.client.table("jobs").select("id").eq(
-                        "url", job.get("url")
-                    ).execute()
-                    
-                    if existing.data:
-                        continue
-                    
-                    data = {
-                        "title": job.get("title"),
-                        "company": job.get("company"),
-                        "url": job.get("url"),
-                        "description": job.get("description"),
-                        "location": job.get("location"),
-                        "source": job.get("source", "tavily"),
-                        "search_query": search_query,
-                        "created_at": datetime.utcnow().isoformat()
-                    }
-                    
-                    self.client.table("jobs").insert(data).execute()
-                    stored += 1
-                    
+                    self.client.table("jobs").update(row).eq("id", job_id).execute()
+                    changed += 1
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to update job: {e}")
+            merged = 0
+            for match, urls, row, sig in plan.merges:
+                added = self._add_alternate_urls(match, urls)
+                merged += self._merged_or_requeue(plan, added, match, row, sig)
+            
+            inserted = []
+            if plan.new_rows:
+                try:
+                    result = self.client.table("jobs").insert([row for row, _ in plan.new_rows]).execute()
+                    inserted = result.data or []
                 except Exception as e:
-                    logger.warning(f"⚠️ Failed to store job: {e}")
-                    continue
+                    # One bad row shouldn't sink the batch
+                    logger.warning(f"⚠️ Batch insert failed ({e}), retrying row by row")
+                    for row, _ in plan.new_rows:
+                        try:
+                            inserted.extend(self.client.table("jobs").insert(row).execute().data or [])
+                        except Exception as row_e:
+                            logger.warning(f"⚠️ Failed to store job: {row_e}")
             
-            logger.info(f"✅ Stored {stored} new jobs")
-            return stored
+            self._bump_rollups(self._stored_deltas(plan, inserted, counted_query))
+            if inserted:
+                self._notify_inserted(inserted)
+            logger.info(f"✅ Stored {len(inserted)} new jobs, updated {changed}, merged {merged} duplicates")
+            return len(inserted)
 
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _sync_store)
     
+    # store_jobs planning, shared by this class and AsyncSupabaseService;
+    # only the reads and writes differ between the two
+    
+    def _incoming_jobs(self, jobs: List[Dict]) -> Dict[str, Dict]:
+        """Canonical URL -> job. Latest copy wins if a batch repeats a URL;
+        near-duplicates within the batch are merged up front"""
+        incoming = {}
+        for job in collapse(jobs, self.dedup_index.threshold):
+            url = canonical_url(job.get("url"))
+            if url:
+                incoming[url] = job
+        return incoming
+    
+    def _plan_store(self, incoming: Dict[str, Dict], known: Dict[str, Dict], search_query: str) -> StorePlan:
+        """Sort a batch into inserts, in-place updates and merges, given the stored rows for its URLs"""
+        plan = StorePlan()
+        for url, job in incoming.items():
+            row = self._job_row(job, url, search_query)
+            current = known.get(url)
+            if current is None:
+                # Same role already stored under another board's URL?
+                sig = signature(job)
+                match = self.dedup_index.find(job, sig)
+                if match is not None:
+                    plan.merges.append((match, [url] + row["alternate_urls"], row, sig))
+                else:
+                    plan.new_rows.append((row, sig))
+            elif current.get("content_hash") != row["content_hash"]:
+                # Posting edited since we saw it: update in place
+                del row["created_at"]
+                plan.updates.append((current["id"], row))
+        return plan
+    
+    def _merged_or_requeue(self, plan: StorePlan, added: Optional[int], match: str, row: Dict, sig) -> int:
+        """URLs merged into `match`; if it was deleted (retention) since it was indexed, insert the row instead"""
+        if added is not None:
+            return added
+        self.dedup_index.remove(match)
+        plan.new_rows.append((row, sig))
+        return 0
+    
+    def _stored_deltas(self, plan: StorePlan, inserted: List[Dict], counted_query: Optional[str]) -> Counter:
+        """Index inserted rows for near-duplicate lookups; rollup deltas for the batch"""
+        sigs = {row["url"]: sig for row, sig in plan.new_rows}
+        for saved in inserted:
+            self.dedup_index.add(saved["id"], saved, sigs.get(saved.get("url")))
+        deltas = rollup_deltas(inserted)
+        deltas.update(query_deltas(counted_query))
+        return deltas
+    
+    def add_insert_listener(self, listener: Callable[[List[Dict]], None]) -> None:
+        """Call `listener(rows)` with the stored rows after each jobs insert"""
+        self._insert_listeners.append(listener)
+    
+    def add_delete_listener(self, listener: Callable[[List[Dict]], None]) -> None:
+        """Call `listener(rows)` with the removed rows after each delete_jobs"""
+        self._delete_listeners.append(listener)
+    
+    def _notify_inserted(self, rows: List[Dict]) -> None:
+        self._notify(self._insert_listeners, rows)
+    
+    def _notify_deleted(self, rows: List[Dict]) -> None:
+        self._notify(self._delete_listeners, rows)
+    
+    @staticmethod
+    def _notify(listeners: List[Callable[[List[Dict]], None]], rows: List[Dict]) -> None:
+        for listener in listeners:
+            try:
+                listener(rows)
+            except Exception as e:
+                logger.warning(f"⚠️ Job listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+    
+    def _bump_rollups(self, deltas: Dict) -> None:
+        """Apply (dimension, key) -> count deltas to job_rollups in one RPC"""
+        if not deltas:
+            return
+        payload = [
+            {"dimension": dimension, "key": key, "count": count}
+            for (dimension, key), count in deltas.items() if count
+        ]
+        try:
+            self.client.rpc("bump_job_rollups", {"deltas": payload}).execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Rollup update failed: {e}")
+    
+    async def get_term_rollups(self, terms: List[str], per_term: int = 200) -> List[Dict]:
+        """Rollup rows for the given title words (prefix lookups, no jobs scan)"""
+        def _sync_get_rollups():
+            rows = []
+            for term in terms:
+                result = self.client.table("job_rollups").select("dimension,key,count").eq(
+                    "dimension", "term"
+                ).eq("key", term).execute()
+                rows.extend(result.data or [])
+                result = self.client.table("job_rollups").select("dimension,key,count").in_(
+                    "dimension", list(TERM_DIMENSIONS)
+                ).like("key", f"{term}|%").order("count", desc=True).limit(per_term).execute()
+                rows.extend(result.data or [])
+            return rows
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_get_rollups)
+    
+    async def get_rollup_top(self, dimension: str, limit: int = 10, by_key: bool = False) -> List[Dict]:
+        """Largest counts of one rollup dimension (or newest keys when by_key)"""
+        def _sync_top():
+            result = self.client.table("job_rollups").select("key,count").eq(
+                "dimension", dimension
+            ).order("key" if by_key else "count", desc=True).limit(limit).execute()
+            return result.data if result.data else []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_top)
+    
+    async def replace_rollups(self, counts: Dict) -> int:
+        """Overwrite job_rollups with freshly computed counts (used by build_rollups.py)"""
+        def _sync_replace():
+            # The write counter isn't derived from jobs (the trigger keeps it): leave it
+            self.client.table("job_rollups").delete().neq("dimension", VERSION_DIMENSION).execute()
+            rows = [
+                {"dimension": dimension, "key": key, "count": count}
+                for (dimension, key), count in counts.items()
+                if count > 0 and dimension != VERSION_DIMENSION
+            ]
+            for i in range(0, len(rows), 1000):
+                self.client.table("job_rollups").upsert(rows[i:i + 1000], on_conflict="dimension,key").execute()
+            return len(rows)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_replace)
+    
+    def _add_alternate_urls(self, job_id: str, urls: List[str]) -> Optional[int]:
+        """Attach other boards' URLs to a stored job, return how many were new (None if it's gone)"""
+        try:
+            result = self.client.table("jobs").select("url,alternate_urls").eq("id", job_id).execute()
+            if not result.data:
+                return None
+            primary = result.data[0]
+            alternates = list(primary.get("alternate_urls") or [])
+            added = [u for u in urls if u and u != primary.get("url") and u not in alternates]
+            if added:
+                self.client.table("jobs").update(
+                    {"alternate_urls": alternates + added}
+                ).eq("id", job_id).execute()
+            return len(added)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to merge duplicate into {job_id}: {e}")
+            return 0
+    
+    @staticmethod
+    def _job_row(job: Dict, url: str, search_query: str) -> Dict[str, Any]:
+        return {
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "url": url,
+            "description": job.get("description"),
+            "location": job.get("location"),
+            "source": job.get("source", "tavily"),
+            "search_query": search_query,
+            "content_hash": content_hash(job),
+            "alternate_urls": [canonical_url(u) for u in job.get("alternate_urls") or []],
+            "created_at": datetime.utcnow().isoformat()
+        }
+    
     async def get_recent_jobs(self, limit: int = 100) -> List[Dict]:
         """Get most recent jobs"""
+        if self.rest:
+            return await self.rest.get_recent_jobs(limit)
+        
         def _sync_get_jobs():
             try:
                 result = self.client.table("jobs").select("*").order(
@@ -142,6 +446,273 @@ class SupabaseService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _sync_get_jobs)
 
+    
+    async def get_jobs_version(self) -> Optional[int]:
+        """
+        Jobs write counter (job_rollups "version" row, kept by the
+        jobs_version trigger); None if unavailable, so no ETag is sent.
+
+        Read on every call: a per-worker cache would let a client that
+        just stored jobs through one worker get a 304 from another.
+        """
+        def _sync_version():
+            try:
+                result = self.client.table("job_rollups").select("count").eq(
+                    "dimension", VERSION_DIMENSION
+                ).eq("key", VERSION_KEY).execute()
+                # No row yet: trigger not installed (or no writes since)
+                return result.data[0]["count"] if result.data else None
+            except Exception as e:
+                logger.warning(f"⚠️ Jobs version check failed: {e}")
+                return None
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_version)
+    
+    async def search_stored_jobs(self, query: str, limit: int = 30) -> List[Dict]:
+        """Keyword match over stored jobs, used when live search is unavailable"""
+        keywords = [
+            w for w in re.findall(r"[a-z0-9+#]+", query.lower())
+            if len(w) > 2 and w not in FALLBACK_STOPWORDS
+        ][:6]
+        if not keywords:
+            return []
+        
+        def _sync_search():
+            try:
+                clauses = ",".join(
+                    f"{col}.ilike.*{kw}*" for kw in keywords for col in ("title", "description", "location")
+                )
+                result = self.client.table("jobs").select("*").or_(clauses).order(
+                    "created_at", desc=True
+                ).limit(limit * 5).execute()
+                rows = result.data or []
+            except Exception as e:
+                logger.error(f"❌ Stored job search failed: {e}")
+                return []
+            
+            def _hits(row):
+                text = " ".join((row.get(c) or "") for c in ("title", "title", "location", "description")).lower()
+                return sum(text.count(kw) for kw in keywords)
+            # Stable sort keeps newest first among equal matches
+            return sorted(rows, key=_hits, reverse=True)[:limit]
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_search)
+    
+    async def get_jobs_page(self, columns: str = "*", after_id: Optional[str] = None,
+                            limit: int = 1000, since: Optional[str] = None,
+                            until: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """One page of jobs in id order (keyset pagination), optionally filtered"""
+        def _sync_page():
+            query = self.client.table("jobs").select(columns).order("id")
+            if after_id:
+                query = query.gt("id", after_id)
+            if since:
+                query = query.gte("created_at", since)
+            if until:
+                query = query.lt("created_at", until)
+            if source:
+                query = query.eq("source", source)
+            result = query.limit(limit).execute()
+            return result.data if result.data else []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_page)
+    
+    async def refresh_dedup_index(self) -> int:
+        """
+        Add jobs stored since the last call (by any worker) to this
+        worker's near-duplicate index; the first call loads the table.
+        Returns how many rows were read.
+
+        Polls on created_at, which store_jobs stamps before the insert
+        commits: each pass starts DEDUP_REFRESH_OVERLAP before the previous
+        one did, so rows committed late (or stamped by a worker whose clock
+        lags a little) are still read. Rows seen twice are skipped by id.
+        """
+        started = datetime.utcnow()
+        loop = asyncio.get_event_loop()
+        read, after_id = 0, None
+        while True:
+            try:
+                page = await self.get_jobs_page("id,title,company,description", after_id,
+                                                since=self._dedup_since)
+            except Exception as e:
+                # Keep the old bound, so the next pass retries this window
+                logger.warning(f"⚠️ Dedup index refresh stopped: {e}")
+                return read
+            # Not signature(): a warm-up pass would flush the memo; off the loop either way
+            await loop.run_in_executor(None, self._index_rows, page)
+            read += len(page)
+            if len(page) < 1000:
+                break
+            after_id = page[-1]["id"]
+        self._dedup_since = (started - DEDUP_REFRESH_OVERLAP).isoformat()
+        return read
+    
+    def _index_rows(self, rows: List[Dict]) -> None:
+        for row in rows:
+            self.dedup_index.add(row["id"], row, minhash(shingles(row)))
+    
+    async def sync_dedup_index(self, interval_seconds: float) -> None:
+        """Warm this worker's dedup index, then keep it in step with other workers' inserts"""
+        await self.refresh_dedup_index()
+        logger.info(f"✅ Dedup index holds {len(self.dedup_index)} jobs")
+        while interval_seconds > 0:
+            await asyncio.sleep(interval_seconds)
+            await self.refresh_dedup_index()
+    
+    async def get_expired_jobs(self, cutoff: str, limit: int = 500) -> List[Dict]:
+        """Oldest-first batch of jobs created before `cutoff` (ISO timestamp)"""
+        def _sync_expired():
+            result = self.client.table("jobs").select("*").lt(
+                "created_at", cutoff
+            ).order("created_at").limit(limit).execute()
+            return result.data if result.data else []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_expired)
+    
+    async def delete_jobs(self, rows: List[Dict]) -> int:
+        """Delete the given job rows and take them out of the dedup index, rollups and delete listeners (embeddings)"""
+        def _sync_delete():
+            ids = [row["id"] for row in rows]
+            if not ids:
+                return 0
+            result = self.client.table("jobs").delete().in_("id", ids).execute()
+            deleted = {row["id"] for row in result.data or []}
+            gone = [row for row in rows if row["id"] in deleted]
+            for row in gone:
+                self.dedup_index.remove(row["id"])
+            self._bump_rollups(rollup_deltas(gone, sign=-1))
+            if gone:
+                self._notify_deleted(gone)
+            return len(gone)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_delete)
+    
+    async def get_jobs_by_ids(self, ids: List[str]) -> List[Dict]:
+        """Jobs for the given ids, in the order the ids were given"""
+        if not ids:
+            return []
+        
+        def _sync_by_ids():
+            try:
+                result = self.client.table("jobs").select("*").in_("id", ids).execute()
+                by_id = {row["id"]: row for row in result.data or []}
+                return [by_id[i] for i in ids if i in by_id]
+            except Exception as e:
+                logger.error(f"❌ Failed to fetch jobs by id: {e}")
+                return []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_by_ids)
+    
+    async def list_profiles(self, columns: str = "email,skills,experience_summary,location") -> List[Dict]:
+        """All profiles (by default only the fields needed to build a search query)"""
+        def _sync_list():
+            try:
+                result = self.client.table("profiles").select(columns).execute()
+                return result.data if result.data else []
+            except Exception as e:
+                logger.error(f"❌ Failed to list profiles: {e}")
+                return []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_list)
+    
+    async def record_search(self, email: str, query: str, searched_at: Optional[str] = None) -> None:
+        """
+        Append to the user's search history (marks 'last searched' for only_new).
+
+        `searched_at` is the watermark the next only_new diffs against:
+        postings created after it count as new. Defaults to now, so call it
+        once the search's own jobs are stored.
+        """
+        def _sync_record():
+            try:
+                self.client.table("search_history").insert({
+                    "email": email,
+                    "query": query,
+                    "searched_at": searched_at or datetime.utcnow().isoformat()
+                }).execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to record search for {email}: {e}")
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, _sync_record)
+    
+    async def get_search_history(self, email: str, limit: int = 5) -> List[Dict]:
+        """The user's most recent searches, newest first"""
+        def _sync_history():
+            try:
+                result = self.client.table("search_history").select("query,searched_at").eq(
+                    "email", email
+                ).order("searched_at", desc=True).limit(limit).execute()
+                return result.data if result.data else []
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to fetch search history for {email}: {e}")
+                return []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_history)
+    
+    async def get_jobs_since(self, search_queries: List[str], since: str, limit: int = 100) -> List[Dict]:
+        """Jobs first stored after `since` by any of these searches (index on search_query, created_at)"""
+        def _sync_since():
+            try:
+                result = self.client.table("jobs").select("*").in_(
+                    "search_query", search_queries
+                ).gt("created_at", since).order("created_at", desc=True).limit(limit).execute()
+                return result.data if result.data else []
+            except Exception as e:
+                # Empty: new_since then keeps the old cutoff as the watermark,
+                # so nothing is skipped on the next try
+                logger.warning(f"⚠️ Failed to fetch jobs since {since}: {e}")
+                return []
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_since)
+    
+    async def save_profile_results(self, email: str, query: str, jobs: List[Dict]) -> None:
+        """Replace the precomputed result set for a profile"""
+        def _sync_save():
+            try:
+                self.client.table("profile_results").upsert({
+                    "email": email,
+                    "query": query,
+                    "jobs": jobs,
+                    "refreshed_at": datetime.utcnow().isoformat()
+                }, on_conflict="email").execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to save results for {email}: {e}")
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, _sync_save)
+    
+    def _clear_profile_results(self, email: str) -> None:
+        try:
+            self.client.table("profile_results").delete().eq("email", email).execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to clear saved results for {email}: {e}")
+    
+    async def get_profile_results(self, email: str) -> Optional[Dict]:
+        """Precomputed result set for a profile, if the refresher built one"""
+        def _sync_get_results():
+            try:
+                result = self.client.table("profile_results").select(
+                    "query,jobs,refreshed_at"
+                ).eq("email", email).execute()
+                return result.data[0] if result.data else None
+            except Exception as e:
+                logger.error(f"❌ Failed to fetch results for {email}: {e}")
+                return None
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _sync_get_results)
+
 
 # Singleton
 supabase_service = SupabaseService()
\ No newline at end of file
@@ -1,23 +1,42 @@
 """Tavily job search client"""
 
+import time
 import logging
 import asyncio
 from typing import List, Dict, Any
 from tavily import TavilyClient as TavilySDK
 from app.config import settings
+from app.services.fork_safe import ForkSafeClient
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
 
-class TavilyClient:
+class TavilyClient(ForkSafeClient):
     """Search for jobs using Tavily AI Search"""
     
     def __init__(self):
-        self.client = TavilySDK(api_key=settings.tavily_api_key)
+        self.client = self._create_client()
+        self._yield_stats: Dict[str, Dict[str, float]] = {}
+        self._escalations = 0
+        self.breaker = CircuitBreaker(
+            "tavily",
+            failure_threshold=settings.tavily_breaker_failures,
+            reset_timeout=settings.tavily_breaker_reset_seconds
+        )
         logger.info("🔍 Tavily initialized")
     
+    def _create_client(self) -> TavilySDK:
+        # tavily_base_url points at a local fake Tavily in tests
+        if settings.tavily_base_url:
+            return TavilySDK(api_key=settings.tavily_api_key, api_base_url=settings.tavily_base_url)
+        return TavilySDK(api_key=settings.tavily_api_key)
+    
     async def search_jobs(self, query: str, max_results: int = 30) -> List[Dict[str, Any]]:
-        """Search for job postings"""
+        """Search for job postings (raises CircuitOpenError while Tavily is failing)"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Search service unavailable (circuit open)")
+        
         logger.info(f"🔍 Searching: {query}")
         
         # 1. HARDEN QUERY: Force site filtering and language
@@ -26,77 +45,137 @@ class TavilyClient:
         search_query = f"{query} {site_filter} job posting hiring English"
         
         try:
-            loop = asyncio.get_event_loop()
-            
-            # Run in thread with timeout
-            response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.client.search(
-                        query=search_query,
-                        search_depth="advanced",
-                        max_results=max_results,
-                        include_domains=[
-                            "linkedin.com",
-                            "indeed.com",
-                            "glassdoor.com",
-                            "rozee.pk",
-                            "mustakbil.com",
-                            "jobee.pk",
-                            "lever.co",
-                            "greenhouse.io",
-                            "workable.com"
-                        ]
-                    )
-                ),
-                timeout=45.0
-            )
-            
-            raw_results = response.get("results", [])
-            logger.info(f"✅ Found {len(raw_results)} raw results")
-            
-            # 2. STRICT DOMAIN FILTER: Throw away anything that isn't a job board or ATS
-            trusted_domains = [
-                "linkedin.com", "indeed.com", "glassdoor.com", "rozee.pk", 
-                "mustakbil.com", "jobee.pk", "lever.co", "greenhouse.io", 
-                "workable.com", "remoteok.com", "we_work_remotely.com"
-            ]
-            
-            jobs = []
-            for r in raw_results:
-                url = r.get("url", "").lower()
-                
-                # Check if URL belongs to a trusted domain
-                if not any(domain in url for domain in trusted_domains):
-                    continue
-                
-                # Filter out obvious non-jobs
-                content = r.get("content", "")
-                if len(content) < 100: # Too short to be a job post
-                    continue
-                    
-                job = {
-                    "title": self._clean_title(r.get("title", "Untitled")),
-                    "company": self._extract_company(r.get("title", "")),
-                    "url": r.get("url", ""),
-                    "description": content[:500],
-                    "location": self._extract_location(content),
-                    "source": "tavily"
-                }
-                
-                if job["url"]:
-                    jobs.append(job)
+            if not settings.tavily_adaptive:
+                jobs = await self._search_once(search_query, "advanced", max_results)
+            else:
+                # Cheap "basic" pass first; pay for "advanced" only when too
+                # few results survive the filters
+                jobs = await self._search_once(search_query, "basic", settings.tavily_basic_results)
+                if len(jobs) < settings.tavily_min_yield:
+                    logger.info(f"[TAVILY] basic kept {len(jobs)} < {settings.tavily_min_yield}, escalating to advanced")
+                    self._escalations += 1
+                    seen = {job["url"] for job in jobs}
+                    try:
+                        more = await self._search_once(search_query, "advanced", max_results)
+                        jobs += [job for job in more if job["url"] not in seen]
+                    except Exception as e:
+                        # Keep what basic found; only an empty result counts against Tavily
+                        if not jobs:
+                            raise
+                        logger.warning(f"⚠️ Advanced escalation failed, keeping {len(jobs)} basic results: {e!r}")
             
             logger.info(f"Filtered down to {len(jobs)} high-quality job results")
+            self.breaker.record_success()
             return jobs
             
+        except asyncio.CancelledError:
+            # Caller gave up (e.g. speculative search past its deadline):
+            # no verdict on Tavily, so don't hold the half-open probe slot
+            self.breaker.release_probe()
+            raise
         except asyncio.TimeoutError:
             logger.error("Tavily search timed out")
-            raise Exception("Search service timed out (45s)")
+            self.breaker.record_failure()
+            raise Exception(f"Search service timed out ({settings.tavily_timeout:.0f}s)")
         except Exception as e:
             logger.error(f"Search failed: {e}")
+            self.breaker.record_failure()
             raise
     
+    async def _search_once(self, search_query: str, depth: str, max_results: int) -> List[Dict[str, Any]]:
+        """One Tavily call at the given depth, filtered; records yield telemetry"""
+        start = time.perf_counter()
+        loop = asyncio.get_event_loop()
+        
+        # Run in thread with timeout
+        response = await asyncio.wait_for(
+            loop.run_in_executor(
+                None,
+                lambda: self.client.search(
+                    query=search_query,
+                    search_depth=depth,
+                    max_results=max_results,
+                    include_domains=[
+                        "linkedin.com",
+                        "indeed.com",
+                        "glassdoor.com",
+                        "rozee.pk",
+                        "mustakbil.com",
+                        "jobee.pk",
+                        "lever.co",
+                        "greenhouse.io",
+                        "workable.com"
+                    ]
+                )
+            ),
+            timeout=settings.tavily_timeout
+        )
+        
+        raw_results = response.get("results", [])
+        logger.info(f"✅ Found {len(raw_results)} raw results ({depth})")
+        jobs = self._filter_results(raw_results)
+        
+        stats = self._yield_stats.setdefault(depth, {"calls": 0, "raw": 0, "kept": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["raw"] += len(raw_results)
+        stats["kept"] += len(jobs)
+        stats["seconds"] += time.perf_counter() - start
+        return jobs
+    
+    def _filter_results(self, raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # 2. STRICT DOMAIN FILTER: Throw away anything that isn't a job board or ATS
+        trusted_domains = [
+            "linkedin.com", "indeed.com", "glassdoor.com", "rozee.pk", 
+            "mustakbil.com", "jobee.pk", "lever.co", "greenhouse.io", 
+            "workable.com", "remoteok.com", "we_work_remotely.com"
+        ]
+        
+        jobs = []
+        for r in raw_results:
+            url = r.get("url", "").lower()
+            
+            # Check if URL belongs to a trusted domain
+            if not any(domain in url for domain in trusted_domains):
+                continue
+            
+            # Filter out obvious non-jobs
+            content = r.get("content", "")
+            if len(content) < 100: # Too short to be a job post
+                continue
+                
+            job = {
+                "title": self._clean_title(r.get("title", "Untitled")),
+                "company": self._extract_company(r.get("title", "")),
+                "url": r.get("url", ""),
+                "description": content[:500],
+                "location": self._extract_location(content),
+                "source": "tavily"
+            }
+            
+            if job["url"]:
+                jobs.append(job)
+        return jobs
+    
+    def telemetry(self) -> Dict[str, Any]:
+        """Per-depth yield since startup, for tuning the adaptive thresholds"""
+        depths = {}
+        for depth, stats in self._yield_stats.items():
+            calls = stats["calls"] or 1
+            depths[depth] = {
+                "calls": stats["calls"],
+                "avg_raw": round(stats["raw"] / calls, 1),
+                "avg_kept": round(stats["kept"] / calls, 1),
+                "yield": round(stats["kept"] / stats["raw"], 3) if stats["raw"] else 0.0,
+                "avg_seconds": round(stats["seconds"] / calls, 2),
+            }
+        basic_calls = self._yield_stats.get("basic", {}).get("calls", 0)
+        return {
+            "adaptive": settings.tavily_adaptive,
+            "min_yield": settings.tavily_min_yield,
+            "escalation_rate": round(self._escalations / basic_calls, 3) if basic_calls else 0.0,
+            "depths": depths,
+        }
+    
     def _clean_title(self, title: str) -> str:
         """Clean job title"""
         for suffix in [" - LinkedIn", " | Indeed", " - Glassdoor"]:
@@ -0,0 +1,210 @@
+"""Streaming, size-capped spooling of uploaded PDFs to disk"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from fastapi import Request, UploadFile
+
+try:
+    import python_multipart as multipart
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # pragma: no cover - older python-multipart releases
+    import multipart
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import parse_options_header
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF"
+CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+# Boundaries, part headers and small form fields around the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+class UploadRejected(Exception):
+    """Upload failed a check while streaming; carries the HTTP status to return"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+    filename: str = ""
+
+    def remove(self) -> None:
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class _PdfSink:
+    """Temp file that checks the %PDF magic and the size cap as bytes arrive"""
+
+    def __init__(self, max_bytes: int, filename: str = ""):
+        self.max_bytes = max_bytes
+        self.filename = filename
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        fd, self.path = tempfile.mkstemp(prefix="cv-", suffix=".pdf")
+        self._out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if len(self.head) < len(PDF_MAGIC):
+            self.head += chunk[:len(PDF_MAGIC) - len(self.head)]
+            if len(self.head) == len(PDF_MAGIC) and self.head != PDF_MAGIC:
+                raise UploadRejected(400, "Invalid PDF file")
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(413, f"File too large (max {self.max_bytes // (1024 * 1024)}MB)")
+        self.digest.update(chunk)
+        self._out.write(chunk)
+
+    def finish(self) -> SpooledUpload:
+        self._out.close()
+        if self.size == 0:
+            raise UploadRejected(400, "Empty file")
+        if self.head != PDF_MAGIC:
+            raise UploadRejected(400, "Invalid PDF file")
+        logger.info(f"[FILE] Spooled {self.size} bytes to {self.path}")
+        return SpooledUpload(path=self.path, size=self.size, sha256=self.digest.hexdigest(),
+                             filename=self.filename)
+
+    def discard(self) -> None:
+        self._out.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+async def spool_pdf_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES,
+                           chunk_size: int = CHUNK_SIZE) -> SpooledUpload:
+    """
+    Copy an already-received upload to a temp file chunk by chunk.
+
+    The %PDF magic is checked on the first bytes and the size cap as data
+    arrives. The sha256 is computed on the way through. Use
+    spool_pdf_request in endpoints: by the time an UploadFile exists,
+    Starlette has already received (and spooled) the whole body.
+    """
+    sink = _PdfSink(max_bytes, getattr(file, "filename", "") or "")
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            sink.write(chunk)
+        return sink.finish()
+    except BaseException:
+        sink.discard()
+        raise
+
+
+class _MultipartPdf:
+    """python-multipart callbacks that stream one file field into a _PdfSink"""
+
+    def __init__(self, field: str, max_bytes: int):
+        self.field = field
+        self.max_bytes = max_bytes
+        self.sink: Optional[_PdfSink] = None
+        self.done = False
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+
+    def callbacks(self) -> Dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._header_field.lower(), self._header_value))
+        self._header_field = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        disposition = dict(self._headers).get(b"content-disposition", b"")
+        _, options = parse_options_header(disposition)
+        if options.get(b"name", b"").decode("latin-1") != self.field or self.sink is not None:
+            return
+        filename = options.get(b"filename", b"").decode("utf-8", errors="replace")
+        # Checked before any file byte is read
+        if not filename.lower().endswith(".pdf"):
+            raise UploadRejected(400, "Only PDF files accepted")
+        self.sink = _PdfSink(self.max_bytes, filename)
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.sink.write(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self.done = True
+
+
+async def spool_pdf_request(request: Request, field: str = "file",
+                            max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """
+    Stream the `field` file of a multipart request body straight to a temp file.
+
+    Reads request.stream() directly, so nothing is buffered ahead of the
+    checks: a Content-Length over the cap is refused before the body is
+    read, a non-.pdf filename or bad magic after the part headers / first
+    bytes, and an oversized body as soon as it passes the cap.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise UploadRejected(400, "Expected a multipart/form-data upload")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes + MULTIPART_OVERHEAD:
+        raise UploadRejected(413, f"File too large (max {max_bytes // (1024 * 1024)}MB)")
+
+    state = _MultipartPdf(field, max_bytes)
+    parser = multipart.MultipartParser(params[b"boundary"], state.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if state.done:
+                break  # the rest of the body is other fields at most
+        if state.sink is None:
+            raise UploadRejected(400, f"No '{field}' file in the upload")
+        if not state.done:
+            raise UploadRejected(400, "Upload ended before the file did")
+        return state.sink.finish()
+    except BaseException as e:
+        if state.sink is not None:
+            state.sink.discard()
+        if isinstance(e, MultipartParseError):
+            raise UploadRejected(400, f"Malformed upload: {e}") from e
+        raise
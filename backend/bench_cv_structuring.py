@@ -0,0 +1,80 @@
+"""
+CV structuring: the old LLM-only path vs the rule-based fast path.
+
+Always reports local extraction time, which fields still go to the LLM and
+prompt size in tokens. With --live (needs
+CEREBRAS_API_KEY) it also times both paths end to end against the LLM.
+
+    python bench_cv_structuring.py [path/to/cv.pdf] [--live]
+"""
+
+import sys
+import time
+import asyncio
+
+SAMPLE_CV = """Ayesha Khan
+ayesha.khan@example.com | +92 300 1234567 | Islamabad, Pakistan
+linkedin.com/in/ayeshakhan
+
+SUMMARY
+Sales Development Representative with 3 years of B2B SaaS experience, consistently 120% of quota.
+
+EXPERIENCE
+SDR, Acme Fintech (2022 - present)
+- Cold calling and email outreach to 80+ prospects a day using HubSpot and LinkedIn Sales Navigator
+- Lead generation and appointment setting for 4 account executives
+- Pipeline management in Salesforce; weekly reporting in Excel
+
+Business Development Associate, Beta Labs (2021 - 2022)
+- Market research and prospecting for the UAE and KSA markets
+- Negotiation support on enterprise deals
+
+SKILLS
+Cold Calling, Lead Generation, Prospecting, CRM, Salesforce, HubSpot, Negotiation, Communication
+
+EDUCATION
+BBA, NUST Business School
+""" * 3
+
+
+async def main():
+    import logging
+    logging.disable(logging.INFO)
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    live = "--live" in sys.argv
+    cv_text = SAMPLE_CV
+    if args:
+        from app.services.pdf_parser import PDFParser
+        cv_text = await PDFParser.extract_text(args[0])
+
+    from app.services.cv_extractor import extract_fields, FIELDS
+    from app.config import settings
+    from app.services.cerebras_client import CerebrasClient
+    from app.services.prompt_budget import count_tokens
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        data, missing = extract_fields(cv_text)
+    local_ms = (time.perf_counter() - start) / runs * 1000
+
+    old_prompt = CerebrasClient._cv_prompt(cv_text, list(FIELDS), settings.cv_prompt_tokens)
+    new_prompt = CerebrasClient._cv_prompt(cv_text, missing, settings.cv_gap_prompt_tokens)
+
+    print(f"rule extraction         {local_ms:8.2f} ms")
+    print(f"found by rules          {', '.join(f for f in FIELDS if f not in missing)}")
+    print(f"left for the LLM        {', '.join(missing)}")
+    print(f"old prompt              {len(old_prompt):8d} chars ({count_tokens(old_prompt)} tokens)")
+    print(f"new prompt              {len(new_prompt):8d} chars ({count_tokens(new_prompt)} tokens)")
+
+    if live:
+        from app.services.cerebras_client import cerebras_client
+        for label, use_rules in (("LLM only", False), ("rules + LLM gaps", True)):
+            start = time.perf_counter()
+            await cerebras_client.structure_cv(cv_text, use_rules=use_rules)
+            print(f"{label:<23} {(time.perf_counter() - start) * 1000:8.0f} ms end to end")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
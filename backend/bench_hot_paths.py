@@ -0,0 +1,125 @@
+"""
+Micro-benchmarks for the pure per-result helpers on the search/onboard path,
+with a stored baseline and a regression gate.
+
+Each case is timed with timeit (best of several repeats, microseconds per
+call) on generated fixtures: a typical input and an adversarial one.
+
+    python bench_hot_paths.py --save            # record bench_baseline.json
+    python bench_hot_paths.py                   # compare, exit 1 on regression
+    python bench_hot_paths.py --threshold 1.3   # or BENCH_THRESHOLD=1.3
+
+Baselines are machine specific: save them on the machine that runs the gate.
+"""
+
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+from app.services.tavily_client import tavily_client
+from app.services.pdf_parser import PDFParser
+from app.services.cerebras_client import CerebrasClient
+from app.services.ranking import rank_jobs
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+DEFAULT_THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "1.5"))
+REPEAT = 5
+
+random.seed(42)
+ROLES = ["Sales Development Representative", "SDR", "Business Development Executive",
+         "Inside Sales Associate", "Account Executive", "Lead Generation Specialist"]
+COMPANIES = ["Acme Fintech", "Beta Labs", "Careem", "Bykea", "Systems Ltd", "Arbisoft"]
+CITIES = ["Islamabad", "Lahore", "Karachi", "Dubai", "London", "Berlin"]
+SUFFIXES = [" - LinkedIn", " | Indeed", " - Glassdoor", ""]
+
+
+def _title() -> str:
+    return f"{random.choice(ROLES)} at {random.choice(COMPANIES)}{random.choice(SUFFIXES)}"
+
+
+def _content(words: int) -> str:
+    vocab = ["outbound", "prospects", "pipeline", "quota", "crm", "meetings", "team", "growth"]
+    body = " ".join(random.choice(vocab) for _ in range(words))
+    return f"{body} based in {random.choice(CITIES)}"
+
+
+def _jobs(n: int) -> List[Dict]:
+    return [{"title": _title(), "location": random.choice(CITIES + ["", "Remote"])} for _ in range(n)]
+
+
+# Page text as MuPDF returns it: columns padded with spaces
+PDF_TEXT = "\n".join(
+    "    ".join(["Cold calling", "HubSpot", "Salesforce", "  Pipeline   management"]) for _ in range(400)
+)
+REPLY = '{"full_name": "Ayesha Khan", "skills": ["CRM", "Cold Calling"], "experience_summary": "SDR."}'
+
+# name -> (function, fixture, calls per timing)
+CASES: Dict[str, Tuple[Callable, object, int]] = {
+    "clean_title/typical": (tavily_client._clean_title, _title(), 20000),
+    "clean_title/long_no_suffix": (tavily_client._clean_title, "Senior SDR " * 200, 5000),
+    "extract_company/typical": (tavily_client._extract_company, _title(), 20000),
+    "extract_company/no_separator": (tavily_client._extract_company, "SDR" * 500, 5000),
+    "extract_location/typical": (tavily_client._extract_location, _content(300), 5000),
+    "extract_location/no_match_50kb": (tavily_client._extract_location, "pipeline " * 6000, 200),
+    "clean_whitespace/cv_page": (PDFParser.clean_whitespace, PDF_TEXT, 200),
+    "clean_whitespace/space_run_64kb": (PDFParser.clean_whitespace, "a" + " " * 65536 + "b", 200),
+    "strip_json_fence/bare": (CerebrasClient.strip_json_fence, REPLY, 50000),
+    "strip_json_fence/fenced": (CerebrasClient.strip_json_fence, f"Here you go:\n```json\n{REPLY}\n```", 50000),
+    "rank_jobs/20_results": (lambda jobs: rank_jobs(jobs, "Islamabad, Pakistan"), _jobs(20), 5000),
+    "rank_jobs/2000_results": (lambda jobs: rank_jobs(jobs, "Islamabad, Pakistan"), _jobs(2000), 50),
+}
+
+
+def measure(fn: Callable, arg: object, number: int) -> float:
+    """Best-of-REPEAT microseconds per call"""
+    times = timeit.repeat(lambda: fn(arg), number=number, repeat=REPEAT)
+    return min(times) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fail when now/baseline exceeds this ratio (default 1.5)")
+    parser.add_argument("-k", dest="only", default="", help="Only cases containing this text")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'case':<34}{'us/call':>12}{'baseline':>12}{'ratio':>8}")
+    for name, (fn, arg, number) in CASES.items():
+        if args.only not in name:
+            continue
+        now = measure(fn, arg, number)
+        results[name] = round(now, 4)
+        base = baseline.get(name)
+        ratio = now / base if base else None
+        flag = ""
+        if ratio and ratio > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34}{now:>12.3f}{base if base else '-':>12}{f'{ratio:.2f}' if ratio else '-':>8}{flag}")
+
+    if args.save:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold}x baseline: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions (threshold {args.threshold}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Database bytes per resume-mode /search request, measured on the wire.
+
+Runs the real POST /search handler (saved-results path, no live search)
+against the local PostgREST stand-in from test_postgrest_async.py and
+counts response bytes per table. For comparison it also makes the read
+the handler used before profile_documents existed: select("*") on a
+profile row that still carries the CV inline.
+
+    python bench_profile_bytes.py [cv_chars]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+from datetime import datetime
+from collections import Counter
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer
+
+from test_postgrest_async import FakePostgrest, TABLES
+
+WORDS = ("sales development representative pipeline quota prospecting outbound "
+         "hubspot salesforce cold calling fintech saas meetings booked revenue "
+         "team lead islamabad pakistan university bachelor experience managed").split()
+EMAIL = "jane@example.com"
+BYTES: Counter = Counter()
+
+
+class CountingPostgrest(FakePostgrest):
+    """The stand-in, counting response body bytes per table"""
+
+    def _send(self, status, data=None):
+        BYTES[urlsplit(self.path).path.rsplit("/", 1)[-1]] += len(json.dumps(data).encode()) if data is not None else 0
+        super()._send(status, data)
+
+
+def make_cv(chars: int) -> str:
+    rnd = random.Random(7)
+    lines = []
+    while sum(len(line) + 1 for line in lines) < chars:
+        lines.append(" ".join(rnd.choices(WORDS, k=rnd.randint(6, 14))).capitalize() + ".")
+    return "\n".join(lines)[:chars]
+
+
+def seed(cv_text: str, inline_cv: bool) -> None:
+    from app.services.compression import compress_text
+    for table in ("profiles", "profile_documents", "profile_results", "search_history", "jobs"):
+        TABLES[table] = []
+    TABLES["profiles"].append({
+        "id": "00000000-0000-0000-0000-000000000001",
+        "full_name": "Jane Doe",
+        "email": EMAIL,
+        "phone": "+92 300 0000000",
+        "location": "Islamabad, Pakistan",
+        "skills": ["Cold Calling", "Lead Generation", "Salesforce", "HubSpot", "Negotiation"],
+        "experience_summary": "Three years as an SDR in fintech, consistently above quota.",
+        "cv_text": cv_text if inline_cv else "",
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+    })
+    TABLES["profile_documents"].append({"email": EMAIL, "cv_text_z": compress_text(cv_text),
+                                        "cv_chars": len(cv_text)})
+    TABLES["profile_results"].append({
+        "email": EMAIL, "query": "SDR Islamabad", "refreshed_at": datetime.utcnow().isoformat(),
+        "jobs": [{"title": f"SDR {i}", "company": "Acme", "url": f"https://example.com/{i}",
+                  "location": "Islamabad, Pakistan", "description": "Outbound role. " * 10} for i in range(20)],
+    })
+
+
+def main():
+    cv_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingPostgrest)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["SUPABASE_KEY"] = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.bench"
+    for key in ("CEREBRAS_API_KEY", "TAVILY_API_KEY"):
+        os.environ.setdefault(key, "test")
+
+    import logging
+    logging.disable(logging.INFO)
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import supabase
+    from app.services.compression import compress_text
+
+    cv_text = make_cv(cv_chars)
+
+    # Before the split: the whole row, CV included, on every profile read
+    seed(cv_text, inline_cv=True)
+    BYTES.clear()
+    supabase.table("profiles").select("*").eq("email", EMAIL).execute()
+    legacy = BYTES["profiles"]
+
+    # Now: one real resume-mode /search (TestClient without `with`: no
+    # lifespan, so no background refresher talking to the stand-in)
+    seed(cv_text, inline_cv=False)
+    BYTES.clear()
+    response = TestClient(app).post("/search", params={"query": EMAIL})
+    assert response.status_code == 200, response.text
+    time.sleep(0.2)  # fire-and-forget search_history write
+
+    print("one resume-mode /search (cached path), response bytes by table:")
+    for table, size in BYTES.most_common():
+        print(f"  {table:<22} {size:>8}")
+    print(f"  {'total':<22} {sum(BYTES.values()):>8}")
+    print(f"profile read now         {BYTES['profiles']:>8} bytes")
+    print(f"profile read before      {legacy:>8} bytes (select * with inline cv_text)")
+    print(f"saved per /search        {legacy - BYTES['profiles']:>8} bytes")
+    blob = compress_text(cv_text)
+    print(f"cv_text stored as        {len(blob):>8} bytes ({blob.split(':')[0]}, "
+          f"{len(blob) / len(cv_text.encode()):.0%} of raw), read only by cover letters / similar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Serialization cost per 100 jobs: pydantic response path vs the trusted
+fast path in app/responses.py (JSON, and msgpack when installed).
+
+    python bench_serialization.py [iterations]
+"""
+
+import sys
+import json
+import time
+from datetime import datetime
+
+from app.models import JobResponse, SearchResponse
+from app.responses import job_payloads, encode_json, msgpack
+
+
+def make_jobs(n: int = 100):
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "title": f"Sales Development Representative {i}",
+            "company": "Acme Fintech",
+            "url": f"https://linkedin.com/jobs/view/{1000 + i}",
+            "description": "We are hiring an SDR to prospect outbound leads and book meetings. " * 7,
+            "location": "Islamabad",
+            "source": "tavily",
+            "search_query": "sdr jobs islamabad",
+            "content_hash": "0" * 40,
+            "alternate_urls": [],
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        for i in range(n)
+    ]
+
+
+def pydantic_path(jobs):
+    # What the routers used to do: build models, then response_model validates again
+    models = [JobResponse(**j) for j in jobs]
+    response = SearchResponse(query="sdr", count=len(models), jobs=models)
+    validated = SearchResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+def fast_json_path(jobs):
+    payload = job_payloads(jobs)
+    return encode_json({"success": True, "query": "sdr", "count": len(payload), "jobs": payload, "cached": False})
+
+
+def fast_msgpack_path(jobs):
+    payload = job_payloads(jobs)
+    return msgpack.packb({"success": True, "query": "sdr", "count": len(payload), "jobs": payload, "cached": False})
+
+
+def bench(fn, jobs, iterations):
+    fn(jobs)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = fn(jobs)
+    elapsed = (time.perf_counter() - start) / iterations
+    return elapsed * 1000, len(body)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    jobs = make_jobs(100)
+
+    paths = [("pydantic + json", pydantic_path), ("trusted + json", fast_json_path)]
+    if msgpack is not None:
+        paths.append(("trusted + msgpack", fast_msgpack_path))
+
+    print(f"{'path':<20} {'ms/100 jobs':>12} {'bytes':>8}")
+    base = None
+    for name, fn in paths:
+        ms, size = bench(fn, jobs, iterations)
+        base = base or ms
+        print(f"{name:<20} {ms:>12.3f} {size:>8}   x{base / ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Onboarding upload cost through the real Starlette request path: the old
+UploadFile path (File(...) -> await file.read() -> validate_pdf(bytes) ->
+extract_text(bytes)) vs the streamed path (spool_pdf_request ->
+validate_pdf(path) -> extract_text(path)).
+
+Requests go through httpx's ASGI transport into a FastAPI app, so the
+multipart body is parsed by Starlette exactly as in production. Reported
+per file size:
+
+  * peak RSS growth of a fresh forked child serving one upload
+  * how much of an oversized (cap + 5MB) body the app pulled before
+    answering 413 (sent with a Content-Length, as browsers do)
+
+    python bench_upload_memory.py [sizes in MB, e.g. 1 3 6 9]
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+
+import fitz  # PyMuPDF
+import httpx
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+
+from app.services.pdf_parser import PDFParser
+from app.services.upload import spool_pdf_request, UploadRejected, MAX_UPLOAD_BYTES
+
+app = FastAPI()
+
+
+@app.post("/old")
+async def old_path(file: UploadFile = File(...)):
+    content = await file.read()
+    if len(content) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    if PDFParser.validate_pdf(content):
+        await PDFParser.extract_text(content)
+    return {"size": len(content)}
+
+
+@app.post("/streamed")
+async def streamed_path(request: Request):
+    try:
+        upload = await spool_pdf_request(request)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    try:
+        if PDFParser.validate_pdf(upload.path):
+            await PDFParser.extract_text(upload.path)
+    finally:
+        upload.remove()
+    return {"size": upload.size}
+
+
+class CountingFile:
+    """File handed to httpx that counts how many body bytes the app pulled"""
+
+    def __init__(self, path: str):
+        self._f = open(path, "rb")
+        self.read_bytes = 0
+
+    def fileno(self) -> int:
+        return self._f.fileno()  # lets httpx send a Content-Length
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.read_bytes += len(data)
+        return data
+
+
+def make_pdf(target_mb: float) -> str:
+    """A one-page CV plus incompressible image pages up to the target size"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 50), "Jane Doe\njane@example.com\nSales Development Representative\n" * 10)
+    target = int(target_mb * 1024 * 1024)
+    while len(doc.tobytes()) < target:
+        pix = fitz.Pixmap(fitz.csRGB, 512, 512, os.urandom(512 * 512 * 3), 0)
+        doc.new_page().insert_image(fitz.Rect(0, 0, 512, 512), pixmap=pix)
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    doc.save(path)
+    return path
+
+
+async def post(route: str, path: str) -> tuple:
+    """(status, body bytes the app read) for one upload"""
+    upload = CountingFile(path)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        files = {"file": ("cv.pdf", upload, "application/pdf")}
+        response = await client.post(route, files=files)
+    return response.status_code, upload.read_bytes
+
+
+def peak_rss_mb(route: str, path: str) -> float:
+    pid = os.fork()
+    if pid == 0:
+        if route:
+            asyncio.run(post(route, path))
+        os._exit(0)
+    _, _, usage = os.wait4(pid, 0)
+    return usage.ru_maxrss / 1024  # KB on Linux
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+
+    sizes = [float(a) for a in sys.argv[1:]] or [1, 3, 6, 9]
+    baseline = peak_rss_mb("", "")
+    print(f"baseline child RSS {baseline:.1f} MB")
+    print(f"{'file MB':>8} {'old +MB':>9} {'streamed +MB':>13}")
+    for mb in sizes:
+        path = make_pdf(mb)
+        try:
+            actual = os.path.getsize(path) / (1024 * 1024)
+            old = peak_rss_mb("/old", path) - baseline
+            new = peak_rss_mb("/streamed", path) - baseline
+            print(f"{actual:>8.1f} {old:>9.1f} {new:>13.1f}")
+        finally:
+            os.unlink(path)
+
+    oversized = make_pdf(MAX_UPLOAD_BYTES / (1024 * 1024) + 5)
+    try:
+        total = os.path.getsize(oversized) / (1024 * 1024)
+        print(f"\noversized upload ({total:.1f} MB, cap {MAX_UPLOAD_BYTES // (1024 * 1024)} MB): body read before 413")
+        for route in ("/old", "/streamed"):
+            status, read = asyncio.run(post(route, oversized))
+            print(f"{route:<10} {status}  {read / (1024 * 1024):6.1f} MB")
+    finally:
+        os.unlink(oversized)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Throughput scaling benchmark for the CPU-bound request paths.
+
+Runs PDF text extraction + job ranking in 1..N forked processes (the same
+model gunicorn uses with preload_app) and prints ops/sec and scaling
+efficiency per worker count.
+
+    python bench_workers.py [max_workers] [seconds_per_run]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import multiprocessing as mp
+
+import fitz  # PyMuPDF
+
+from app.services.pdf_parser import PDFParser
+from app.services.ranking import rank_jobs
+
+LOCATIONS = ["Islamabad", "Lahore", "Karachi", "Remote", "Hybrid", None]
+
+
+def create_cv_pdf(pages: int = 3) -> bytes:
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        lines = [f"John Doe - page {p + 1}", "john@example.com", "Senior SDR  |  Lead Generation  |  Cold Calling"]
+        lines += [f"Experience line {i}:  closed  deals  with  fintech  clients" for i in range(40)]
+        page.insert_text((50, 50), "\n".join(lines), fontsize=9)
+    return doc.tobytes()
+
+
+def create_jobs(n: int = 200):
+    rnd = random.Random(42)
+    return [
+        {"title": f"SDR {i}", "url": f"https://linkedin.com/jobs/{i}", "location": rnd.choice(LOCATIONS)}
+        for i in range(n)
+    ]
+
+
+PDF_BYTES = create_cv_pdf()
+JOBS = create_jobs()
+
+
+def one_op() -> None:
+    asyncio.run(PDFParser.extract_text(PDF_BYTES))
+    rank_jobs(JOBS, "Islamabad, Pakistan")
+
+
+def worker(deadline: float, counter) -> None:
+    done = 0
+    while time.perf_counter() < deadline:
+        one_op()
+        done += 1
+    with counter.get_lock():
+        counter.value += done
+
+
+def run(workers: int, seconds: float) -> float:
+    ctx = mp.get_context("fork")
+    counter = ctx.Value("i", 0)
+    deadline = time.perf_counter() + seconds
+    procs = [ctx.Process(target=worker, args=(deadline, counter)) for _ in range(workers)]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return counter.value / (time.perf_counter() - start)
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    base = None
+    print(f"{'workers':>8} {'ops/sec':>10} {'speedup':>8} {'efficiency':>10}")
+    for n in counts:
+        ops = run(n, seconds)
+        base = base or ops
+        speedup = ops / base
+        print(f"{n:>8} {ops:>10.1f} {speedup:>8.2f} {speedup / n:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Offline embedding step: embed every stored job and every profile's CV into
+the local index used by GET /jobs/similar. Safe to re-run; jobs already in
+the index are skipped and profiles are re-embedded.
+
+    python build_embeddings.py
+"""
+
+import asyncio
+import logging
+from app.services.supabase_service import supabase_service
+from app.services.embedding_index import embedding_index
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def build():
+    if not embedding_index.available:
+        logger.error("❌ numpy is not installed: pip install numpy")
+        return
+    logger.info("Embedding jobs...")
+    after_id = None
+    total = 0
+    while True:
+        page = await supabase_service.get_jobs_page("id,title,company,location,description", after_id)
+        total += embedding_index.add_jobs(page)
+        if len(page) < 1000:
+            break
+        after_id = page[-1]["id"]
+    logger.info(f"✅ {total} new jobs embedded ({len(embedding_index.jobs)} in index)")
+
+    logger.info("Embedding profiles...")
+    profiles = await supabase_service.list_profiles("email,skills,experience_summary")
+    for profile in profiles:
+        if profile.get("email"):
+            profile["cv_text"] = await supabase_service.get_cv_text(profile["email"])
+            embedding_index.add_profile(profile["email"], profile)
+    logger.info(f"✅ {len(profiles)} profiles embedded")
+
+
+if __name__ == "__main__":
+    asyncio.run(build())
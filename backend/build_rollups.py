@@ -0,0 +1,47 @@
+"""
+Rebuild the job_rollups table from scratch (one keyset pass over `jobs`).
+Day to day the rollups are kept current by store_jobs; run this once after
+creating the table, or to repair drift.
+
+    python build_rollups.py
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from app.services.supabase_service import supabase_service
+from app.services.rollups import rollup_deltas, query_deltas
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def build():
+    counts: Counter = Counter()
+    searches = set()
+    after_id = None
+    total = 0
+    while True:
+        page = await supabase_service.get_jobs_page(
+            "id,title,company,location,source,created_at,search_query", after_id
+        )
+        counts.update(rollup_deltas(page))
+        # Past searches aren't logged; one store_jobs batch shares a query
+        # and (nearly) a timestamp, so count distinct (query, minute) pairs.
+        # Rows don't record whether /search or the profile refresher stored
+        # them, so a rebuild over-counts refreshed queries a little
+        searches.update(
+            (row.get("search_query"), (row.get("created_at") or "")[:16]) for row in page
+        )
+        total += len(page)
+        if len(page) < 1000:
+            break
+        after_id = page[-1]["id"]
+    for query, _ in searches:
+        counts.update(query_deltas(query))
+    written = await supabase_service.replace_rollups(counts)
+    logger.info(f"✅ {written} rollup rows from {total} jobs")
+
+
+if __name__ == "__main__":
+    asyncio.run(build())
@@ -1,29 +1,62 @@
+"""
+Empty the database, or run a retention pass by hand.
+
+    python clear_db.py                  # delete ALL jobs and ALL profile data
+    python clear_db.py --jobs-only      # delete all jobs, keep profiles
+    python clear_db.py --days 30        # retention pass only: archive + delete jobs older than 30 days
+
+Jobs always go through the retention path (archived under
+RETENTION_ARCHIVE_DIR, then deleted), so rollups, the dedup and embedding
+indexes stay in step. Profile data is every per-user table: profiles,
+profile_documents, profile_results and search_history.
+"""
+
 import asyncio
+import argparse
 import logging
 from app.database import supabase
+from app.services.retention import job_retention
+from app.services.supabase_service import supabase_service
+from app.services.embedding_index import embedding_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def clear_database():
-    """Delete all records from jobs and profiles tables"""
-    logger.info("🗑️ Clearing database...")
-    
-    try:
-        # Delete jobs
-        logger.info("Deleting jobs...")
-        jobs_result = supabase.table("jobs").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-        logger.info(f"✅ Deleted jobs")
-
-        # Delete profiles
-        logger.info("Deleting profiles...")
-        profiles_result = supabase.table("profiles").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-        logger.info(f"✅ Deleted profiles")
-        
-        logger.info("✨ Database is now empty!")
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to clear database: {e}")
+# table -> a filter every row matches (PostgREST refuses an unfiltered delete)
+PROFILE_TABLES = {
+    "search_history": ("id", "gte", 0),
+    "profile_results": ("email", "neq", ""),
+    "profile_documents": ("email", "neq", ""),
+    "profiles": ("id", "neq", "00000000-0000-0000-0000-000000000000"),
+}
+
+
+async def clear_database(days=None, profiles=True):
+    """Archive and delete jobs (older than `days`, or all), then optionally all profile data"""
+    if embedding_index.available:
+        supabase_service.add_delete_listener(embedding_index.remove_jobs)
+
+    logger.info("🗑️ Deleting jobs..." if days is None else f"🗑️ Deleting jobs older than {days} days...")
+    report = await job_retention.run_once(days=0 if days is None else days)
+    logger.info(f"✅ {report['rows']} jobs removed, archive: {report['archive']}")
+
+    if not profiles:
+        return
+    for table, (column, op, value) in PROFILE_TABLES.items():
+        try:
+            logger.info(f"Deleting {table}...")
+            getattr(supabase.table(table).delete(), op)(column, value).execute()
+            logger.info(f"✅ Deleted {table}")
+        except Exception as e:
+            logger.error(f"❌ Failed to delete {table}: {e}")
+    logger.info("✨ Database is now empty!" if days is None else "✨ Profile data deleted")
+
 
 if __name__ == "__main__":
-    asyncio.run(clear_database())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--days", type=int, default=None,
+                       help="Retention pass only: delete jobs older than this, keep profiles")
+    group.add_argument("--jobs-only", action="store_true", help="Delete all jobs, keep profiles")
+    args = parser.parse_args()
+    asyncio.run(clear_database(args.days, profiles=args.days is None and not args.jobs_only))
@@ -1,9 +1,7 @@
 from mcp.server.fastapi import Context, FastApiServer
 from fastapi import FastAPI
 import uvicorn
-import requests
-from bs4 import BeautifulSoup
-import json
+from ui_fetcher import page_fetcher
 
 app = FastAPI(title="Generic UI Scraper MCP")
 server = FastApiServer(app)
@@ -15,26 +13,9 @@ async def fetch_ui_from_url(ctx: Context, url: str):
     Use this when the user gives you a website link (like flyingpapers.com/bag).
     """
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style tags from body for cleaner text/structure
-        body = soup.find('body')
-        if not body:
-            return {"error": "No body tag found"}
-            
-        # Get all styles
-        styles = [s.text for s in soup.find_all('style')]
-        
-        return {
-            "url": url,
-            "title": soup.title.string if soup.title else "No Title",
-            "html_structure": str(body)[:5000],  # Limit to 5000 chars for context
-            "styles_found": len(styles),
-            "inline_styles": styles[:5] # First 5 style tags
-        }
+        # Pooled async client, capped download, ETag/Last-Modified cache;
+        # parsing runs in a thread so other tool calls keep flowing
+        return await page_fetcher.fetch(url)
     except Exception as e:
         return {"error": str(e)}
 
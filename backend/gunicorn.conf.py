@@ -0,0 +1,35 @@
+"""Gunicorn config - production multi-process serving
+
+Run from backend/:
+    gunicorn app.main:app -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) so imports, compiled
+regexes and PyMuPDF are shared copy-on-write with every worker. Network
+clients (Supabase, Cerebras/OpenAI, Tavily) are rebuilt lazily in each
+worker after fork - see app/services/fork_safe.py.
+"""
+
+import os
+import multiprocessing
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# LLM + Tavily calls can take 45s+; don't let the arbiter kill busy workers
+timeout = int(os.environ.get("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    # Drop any client the master built while preloading; the next request
+    # in this worker creates its own connection pool.
+    from app.services.cerebras_client import cerebras_client
+    from app.services.tavily_client import tavily_client
+    from app.services.supabase_service import supabase_service
+
+    for service in (cerebras_client, tavily_client, supabase_service):
+        service.reset_client()
+    server.log.info(f"Worker {worker.pid} ready (clients reset)")
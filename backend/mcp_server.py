@@ -1,6 +1,8 @@
 from mcp.server.fastapi import Context, FastApiServer
 from fastapi import FastAPI
 import uvicorn
+from app.services.supabase_service import supabase_service
+from app.services.rollups import title_terms, summarize_terms
 
 app = FastAPI(title="SDR Job Agent MCP")
 server = FastApiServer(app)
@@ -22,8 +24,29 @@ async def get_design_tokens(ctx: Context):
 
 @server.tool()
 async def get_job_search_context(ctx: Context, query: str):
-    """Provides additional context for job searching based on recent trends."""
-    return f"Context for '{query}': High demand for remote SDR roles in Pakistan Fintech sector."
+    """Provides context for job searching from the stored jobs (precomputed rollups)."""
+    terms = title_terms(query)
+    if not terms:
+        return f"Context for '{query}': no searchable keywords in the query."
+    try:
+        rows = await supabase_service.get_term_rollups(terms)
+    except Exception as e:
+        return f"Context for '{query}': trend data unavailable ({e})."
+    summary = summarize_terms(rows, terms)
+    if not any(summary["terms"].values()):
+        return f"Context for '{query}': no stored postings mention {', '.join(terms)} yet."
+
+    def _top(pairs):
+        return ", ".join(f"{value} ({count})" for value, count in pairs) or "n/a"
+
+    matches = ", ".join(f"{term}: {count}" for term, count in summary["terms"].items())
+    return (
+        f"Context for '{query}' from stored postings ({matches}).\n"
+        f"Top companies: {_top(summary['companies'])}\n"
+        f"Top locations: {_top(summary['locations'])}\n"
+        f"Sources: {_top(summary['sources'])}\n"
+        f"Related title terms: {_top(summary['related_terms'])}"
+    )
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
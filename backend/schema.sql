@@ -0,0 +1,87 @@
+-- Supabase schema additions used by the backend.
+-- `profiles` and `jobs` are created from the Supabase dashboard; run the
+-- statements below in the SQL editor to add what newer features rely on.
+
+-- Delta detection for stored postings (store_jobs keys on canonical url)
+alter table jobs add column if not exists content_hash text;
+create unique index if not exists jobs_url_idx on jobs (url);
+
+-- Precomputed per-profile results written by the background refresher
+create table if not exists profile_results (
+    email text primary key,
+    query text,
+    jobs jsonb not null default '[]',
+    refreshed_at timestamptz default now()
+);
+
+-- Near-duplicate postings from other boards are folded into one row
+alter table jobs add column if not exists alternate_urls text[] default '{}';
+
+-- Full CV text, compressed ("zstd:" / "zlib:" + base64), kept off the
+-- profiles row so profile reads stay small
+create table if not exists profile_documents (
+    email text primary key,
+    cv_text_z text not null,
+    cv_chars integer,
+    updated_at timestamptz default now()
+);
+
+-- Content-addressed lookup for repeated CV uploads (sha256 of the PDF bytes)
+alter table profile_documents add column if not exists content_sha256 text;
+create index if not exists profile_documents_sha_idx on profile_documents (content_sha256);
+
+-- Incremental rollups over stored jobs. store_jobs sends per-batch count
+-- deltas, so reads never scan `jobs` (GET /jobs/stats, the MCP trend
+-- tool). Dimensions: company, location, source, day, term, query (searches
+-- per query), version (key "jobs": write counter used as the GET /jobs
+-- ETag, bumped by the jobs_version trigger below) and term_*, whose keys are
+-- "<title word>|<value>". Rebuild from scratch with build_rollups.py.
+create table if not exists job_rollups (
+    dimension text not null,
+    key text not null,
+    count bigint not null default 0,
+    primary key (dimension, key)
+);
+create index if not exists job_rollups_prefix_idx on job_rollups (dimension, key text_pattern_ops);
+create index if not exists job_rollups_top_idx on job_rollups (dimension, count desc);
+
+create or replace function bump_job_rollups(deltas jsonb) returns void
+language sql as $$
+    insert into job_rollups (dimension, key, count)
+    select d->>'dimension', d->>'key', (d->>'count')::bigint
+    from jsonb_array_elements(deltas) d
+    on conflict (dimension, key) do update
+        set count = job_rollups.count + excluded.count;
+    delete from job_rollups r
+    using jsonb_array_elements(deltas) d
+    where r.dimension = d->>'dimension' and r.key = d->>'key' and r.count <= 0;
+$$;
+
+-- Every write to jobs, from any worker or from the dashboard, bumps the
+-- version row in the same transaction, so GET /jobs never serves a 304
+-- for changed rows (a best-effort bump from the app could be lost)
+create or replace function bump_jobs_version() returns trigger
+language plpgsql as $$
+begin
+    insert into job_rollups (dimension, key, count) values ('version', 'jobs', 1)
+    on conflict (dimension, key) do update set count = job_rollups.count + 1;
+    return null;
+end;
+$$;
+drop trigger if exists jobs_version on jobs;
+create trigger jobs_version after insert or update or delete on jobs
+    for each statement execute function bump_jobs_version();
+
+-- Retention scans expired postings oldest first (app/services/retention.py)
+create index if not exists jobs_created_at_idx on jobs (created_at);
+
+-- Per-user search history; the newest row is "last searched" for
+-- /search?only_new=true, which reads jobs first stored after it
+create table if not exists search_history (
+    id bigserial primary key,
+    email text not null,
+    query text,
+    searched_at timestamptz not null default now()
+);
+create index if not exists search_history_email_idx on search_history (email, searched_at desc);
+create index if not exists jobs_search_query_created_idx on jobs (search_query, created_at);
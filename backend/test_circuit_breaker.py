@@ -0,0 +1,104 @@
+"""
+Circuit breaker demo against a local fake Tavily (no network, no API key).
+
+The fake serves /search and can be switched between healthy, hanging and
+failing. Watch the breaker go closed -> open -> half-open -> closed, with
+a cancelled half-open probe in between.
+
+    python test_circuit_breaker.py
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODE = {"value": "ok"}
+
+FAKE_RESULT = {
+    "title": "Sales Development Representative at Acme - LinkedIn",
+    "url": "https://www.linkedin.com/jobs/view/123",
+    "content": "Acme is hiring an SDR in Islamabad to prospect outbound leads and book meetings. " * 3,
+}
+
+
+class FakeTavily(BaseHTTPRequestHandler):
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if MODE["value"] == "hang" or (MODE["value"] == "slow-advanced" and request.get("search_depth") == "advanced"):
+            time.sleep(3)
+        if MODE["value"] == "error":
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b'{"detail": "boom"}')
+            return
+        body = json.dumps({"results": [FAKE_RESULT]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTavily)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+async def attempt(client, label):
+    start = time.perf_counter()
+    try:
+        jobs = await client.search_jobs("SDR Islamabad")
+        outcome = f"ok ({len(jobs)} jobs)"
+    except Exception as e:
+        outcome = f"{type(e).__name__}: {e}"
+    print(f"{label:<28} {outcome:<55} {time.perf_counter() - start:5.2f}s  breaker={client.breaker.state}")
+
+
+async def test_breaker():
+    os.environ.update({
+        "TAVILY_BASE_URL": start_fake(),
+        "TAVILY_TIMEOUT": "1",
+        "TAVILY_BREAKER_FAILURES": "2",
+        "TAVILY_BREAKER_RESET_SECONDS": "2",
+    })
+    for key in ("CEREBRAS_API_KEY", "TAVILY_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"):
+        os.environ.setdefault(key, "test")
+
+    from app.services.tavily_client import tavily_client
+
+    await attempt(tavily_client, "healthy")
+    MODE["value"] = "hang"
+    await attempt(tavily_client, "hang #1")
+    await attempt(tavily_client, "hang #2 (opens)")
+    await attempt(tavily_client, "while open (fails fast)")
+    await asyncio.sleep(2.1)
+    # A cancelled probe (speculative search past its deadline) must give
+    # its half-open slot back instead of leaving the circuit stuck
+    probe = asyncio.create_task(tavily_client.search_jobs("SDR Islamabad"))
+    await asyncio.sleep(0.2)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    print(f"{'cancelled half-open probe':<28} {'cancelled':<55} {'':5}   breaker={tavily_client.breaker.state}")
+    MODE["value"] = "ok"
+    await attempt(tavily_client, "half-open probe")
+    await attempt(tavily_client, "closed again")
+
+    # Escalation to "advanced" timing out keeps the basic results and is
+    # not a breaker failure
+    MODE["value"] = "slow-advanced"
+    for i in range(3):
+        await attempt(tavily_client, f"advanced times out #{i + 1}")
+
+    assert tavily_client.breaker.state == "closed"
+    print("\n✅ SUCCESS: breaker opened on timeouts and recovered via probe; escalation failures kept basic results")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_breaker())
@@ -0,0 +1,53 @@
+"""
+Near-duplicate detection: the same posting on several boards collapses to
+one entry; distinct roles that only share title words don't.
+
+    python test_dedup.py
+"""
+
+from app.services.dedup import collapse, normalize_company, NearDuplicateIndex
+
+DESCRIPTION = ("Acme is hiring a Sales Development Representative to book meetings with "
+               "fintech prospects. You will run outbound sequences in HubSpot, qualify "
+               "inbound leads and hand them to account executives.")
+
+
+def test_same_posting_across_boards():
+    # Companies as tavily_client._extract_company returns them: board suffix included
+    jobs = [
+        {"title": "SDR at Acme - LinkedIn", "company": "Acme - LinkedIn",
+         "url": "https://linkedin.com/jobs/view/1", "description": DESCRIPTION},
+        {"title": "SDR at Acme | Indeed", "company": "Acme | Indeed",
+         "url": "https://indeed.com/viewjob?jk=2", "description": DESCRIPTION},
+        {"title": "SDR at Acme - Glassdoor", "company": "Acme - Glassdoor",
+         "url": "https://glassdoor.com/job-listing/3", "description": DESCRIPTION},
+    ]
+    assert normalize_company("Acme | Indeed") == normalize_company("Acme - LinkedIn") == "acme"
+    assert normalize_company("LinkedIn") == ""
+    merged = collapse(jobs)
+    print(f"3 boards -> {len(merged)} entries, alternates {merged[0]['alternate_urls']}")
+    assert len(merged) == 1
+    assert merged[0]["alternate_urls"] == [j["url"] for j in jobs[1:]]
+
+
+def test_title_only_is_not_a_match():
+    jobs = [
+        {"title": "Senior SDR", "company": None, "url": "https://example.com/a", "description": ""},
+        {"title": "SDR", "company": None, "url": "https://example.com/b", "description": ""},
+    ]
+    merged = collapse(jobs)
+    print(f"'Senior SDR' / 'SDR' without company or description -> {len(merged)} entries")
+    assert len(merged) == 2
+
+    index = NearDuplicateIndex()
+    index.add("1", jobs[0])
+    assert index.find(jobs[1]) is None
+    # Same company is enough evidence on its own
+    acme = [{**job, "company": "Acme"} for job in jobs]
+    assert len(collapse([acme[1], {**acme[1], "url": "https://example.com/c"}])) == 1
+
+
+if __name__ == "__main__":
+    test_same_posting_across_boards()
+    test_title_only_is_not_a_match()
+    print("✅ SUCCESS: cross-board duplicates merged, title-only matches kept apart")
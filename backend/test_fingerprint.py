@@ -0,0 +1,29 @@
+"""
+Canonical posting URLs: tracking params are dropped, identity params kept.
+
+    python test_fingerprint.py
+"""
+
+from app.services.fingerprint import canonical_url
+
+
+def test_tracking_params_dropped():
+    a = canonical_url("https://www.linkedin.com/jobs/view/3811/?trk=public_jobs&refId=abc&utm_source=x")
+    b = canonical_url("http://linkedin.com/jobs/view/3811")
+    print(f"{a} == {b}")
+    assert a == b == "https://linkedin.com/jobs/view/3811"
+
+
+def test_linkedin_current_job_id_is_the_job():
+    first = canonical_url("https://www.linkedin.com/jobs/search/?currentJobId=3811&keywords=sdr&trk=x")
+    second = canonical_url("https://www.linkedin.com/jobs/search/?currentJobId=4020&keywords=sdr&trk=x")
+    print(f"{first} != {second}")
+    assert first != second
+    assert first == canonical_url("https://www.linkedin.com/jobs/view/3811")
+    assert canonical_url("https://www.linkedin.com/jobs/collections/recommended/?currentJobId=4020") == second
+
+
+if __name__ == "__main__":
+    test_tracking_params_dropped()
+    test_linkedin_current_job_id_is_the_job()
+    print("✅ SUCCESS: canonical URLs keep one key per posting")
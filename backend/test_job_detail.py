@@ -0,0 +1,108 @@
+"""
+Job detail hydration against a local HTTP fixture (no network, no Supabase).
+
+Checks JSON-LD and plain-HTML extraction, request coalescing (20
+concurrent opens -> one fetch), that the first caller disconnecting
+doesn't cancel the shared fetch, the cache hit, TTL expiry and the size
+bound.
+
+    python test_job_detail.py
+"""
+
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.job_detail import JobDetailService, DetailCache
+
+FULL_TEXT = "We are hiring an SDR to own outbound prospecting across the GCC. " * 20
+LD_PAGE = f"""<html><head><script type="application/ld+json">
+{json.dumps({"@type": "JobPosting", "title": "SDR", "description": f"<p>{FULL_TEXT}</p><ul><li>HubSpot daily</li></ul>"})}
+</script></head><body><nav>Jobs Login Sign up</nav><p>ignored</p></body></html>"""
+HTML_PAGE = f"""<html><body><header>Menu</header><nav>Home | Jobs</nav>
+<article><h1>Account Executive</h1><p>{FULL_TEXT}</p><p>Short</p></article>
+<script>var tracking = 1;</script><footer>Copyright and cookie text footer links here</footer></body></html>"""
+HITS = {"/ld": 0, "/html": 0, "/ld2": 0}
+
+
+class Fixture(BaseHTTPRequestHandler):
+    def do_GET(self):
+        HITS[self.path] = HITS.get(self.path, 0) + 1
+        time.sleep(0.2)  # slow enough for concurrent opens to overlap
+        body = (LD_PAGE if self.path.startswith("/ld") else HTML_PAGE).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Fixture)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+async def main():
+    base = start_fixture()
+    rows = {
+        "1": {"id": "1", "title": "SDR", "company": "Acme", "url": f"{base}/ld", "description": FULL_TEXT[:500]},
+        "2": {"id": "2", "title": "AE", "company": "Beta", "url": f"{base}/html", "description": FULL_TEXT[:500]},
+        "3": {"id": "3", "title": "SDR", "company": "Gamma", "url": f"{base}/ld2", "description": FULL_TEXT[:500]},
+    }
+    loads = {"count": 0}
+
+    async def load_job(job_id):
+        loads["count"] += 1
+        return rows.get(job_id)
+
+    service = JobDetailService()
+
+    results = await asyncio.gather(*(service.get("1", load_job) for _ in range(20)))
+    fresh = [r for r in results if not r["cached"]]
+    print(f"20 concurrent opens: {HITS['/ld']} fetch, {loads['count']} row load, source={results[0]['source']}, "
+          f"{len(results[0]['description'])} chars (stored had 500)")
+    assert HITS["/ld"] == 1 and loads["count"] == 1 and len(fresh) == 1
+    assert results[0]["source"] == "jsonld" and "HubSpot daily" in results[0]["description"]
+
+    again = await service.get("1", load_job)
+    assert again["cached"] and HITS["/ld"] == 1
+    assert service.cached_text("1") == again["description"]
+
+    # First opener disconnects mid-fetch: the others still get the result
+    opener = asyncio.create_task(service.get("3", load_job))
+    await asyncio.sleep(0.05)
+    waiters = [asyncio.create_task(service.get("3", load_job)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    opener.cancel()
+    waited = await asyncio.gather(*waiters)
+    print(f"first caller cancelled: {len(waited)} waiters served, {HITS['/ld2']} fetch")
+    assert HITS["/ld2"] == 1 and all(w and w["source"] == "jsonld" for w in waited)
+    assert service.cached_text("3")
+
+    html = await service.get("2", load_job)
+    print(f"html page: source={html['source']}, nav/footer/script dropped: "
+          f"{not any(w in html['description'] for w in ('Menu', 'tracking', 'Copyright'))}")
+    assert html["source"] == "html" and "Menu" not in html["description"] and "tracking" not in html["description"]
+
+    assert await service.get("404", load_job) is None
+
+    cache = DetailCache(max_entries=2, max_bytes=100, ttl=0.1)
+    cache.set("a", {"description": "x" * 60})
+    cache.set("b", {"description": "y" * 60})  # over 100 bytes -> "a" evicted
+    assert cache.get("a") is None and cache.get("b") is not None
+    await asyncio.sleep(0.15)
+    assert cache.get("b") is None  # expired
+    print("cache: size bound and TTL OK")
+
+    await service.aclose()
+    print("[SUCCESS] job detail hydration OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+"""
+Async PostgREST layer against a local stand-in (no Supabase needed).
+
+The stand-in keeps tables in memory and understands the subset of the
+PostgREST API the layer uses: select, eq./in. filters, order, limit,
+inserts/upserts with Prefer headers, PATCH and rpc/bump_job_rollups.
+
+    python test_postgrest_async.py
+"""
+
+import re
+import json
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TABLES = {"profiles": [], "profile_documents": [], "jobs": []}
+CLIENT_PORTS = set()
+NEXT_ID = {"value": 0}
+ROLLUP_BUMPS = []
+
+
+def _matches(row, params):
+    for column, expr in params.items():
+        if column in ("select", "order", "limit", "on_conflict"):
+            continue
+        op, _, value = expr.partition(".")
+        if op == "eq" and str(row.get(column)) != value:
+            return False
+        if op == "in":
+            values = [v.replace('\\"', '"') for v in re.findall(r'"((?:[^"\\]|\\.)*)"', value)]
+            if str(row.get(column)) not in values:
+                return False
+    return True
+
+
+def _project(row, select):
+    return dict(row) if select in (None, "*") else {c: row.get(c) for c in select.split(",")}
+
+
+class FakePostgrest(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _parts(self):
+        CLIENT_PORTS.add(self.client_address[1])
+        parts = urlsplit(self.path)
+        return parts.path.rsplit("/", 1)[-1], dict(parse_qsl(parts.query))
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _send(self, status, data=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        table, params = self._parts()
+        rows = [r for r in TABLES[table] if _matches(r, params)]
+        if "order" in params:
+            column, _, direction = params["order"].partition(".")
+            rows.sort(key=lambda r: r.get(column) or "", reverse=direction == "desc")
+        if "limit" in params:
+            rows = rows[:int(params["limit"])]
+        self._send(200, [_project(r, params.get("select")) for r in rows])
+
+    def do_POST(self):
+        table, params = self._parts()
+        body = self._body()
+        if "/rpc/" in self.path:
+            ROLLUP_BUMPS.extend(body.get("deltas", []))
+            return self._send(204)
+        rows = body if isinstance(body, list) else [body]
+        out = []
+        for row in rows:
+            key = params.get("on_conflict")
+            existing = next((r for r in TABLES[table] if key and r.get(key) == row.get(key)), None)
+            if existing:
+                existing.update(row)
+                out.append(existing)
+                continue
+            if table == "jobs" and any(r["url"] == row["url"] for r in TABLES[table]):
+                return self._send(409, {"message": "duplicate key value violates unique constraint"})
+            NEXT_ID["value"] += 1
+            row = {"id": f"{NEXT_ID['value']:06d}", **row}
+            TABLES[table].append(row)
+            out.append(row)
+        self._send(201, out)
+
+    def do_PATCH(self):
+        table, params = self._parts()
+        body = self._body()
+        rows = [r for r in TABLES[table] if _matches(r, params)]
+        for row in rows:
+            row.update(body)
+        self._send(200, rows)
+
+    def do_DELETE(self):
+        table, params = self._parts()
+        rows = [r for r in TABLES.setdefault(table, []) if _matches(r, params)]
+        TABLES[table] = [r for r in TABLES[table] if r not in rows]
+        self._send(200, rows)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePostgrest)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def job(i, **extra):
+    return {
+        "title": f"SDR {i}", "company": f"Company {i}", "url": f"https://www.example.com/jobs/{i}?utm_source=x",
+        "description": f"Outbound role {i} " + " ".join(f"word{i}x{k}" for k in range(40)),
+        "location": "Islamabad, Pakistan", **extra
+    }
+
+
+async def main():
+    from app.services.supabase_service import supabase_service
+    from app.services.postgrest_async import AsyncSupabaseService, PostgrestAsync
+
+    db = AsyncSupabaseService(supabase_service, PostgrestAsync(start_fake(), key="test"))
+
+    profile = await db.create_profile({"email": "a@b.com", "full_name": "Ali", "skills": ["CRM"], "cv_text": "cv"})
+    assert profile["email"] == "a@b.com"
+    # Re-onboarding drops results saved for the old CV
+    TABLES["profile_results"] = [{"email": "a@b.com", "query": "old", "jobs": []}]
+    await db.create_profile({"email": "a@b.com", "full_name": "Ali Khan", "cv_text": "cv"})
+    assert TABLES["profile_results"] == []
+    fetched = await db.get_profile_by_email("a@b.com", "email,full_name")
+    print(f"profile: {fetched}")
+    assert fetched == {"email": "a@b.com", "full_name": "Ali Khan"} and len(TABLES["profiles"]) == 1
+
+    stored = await db.store_jobs([job(i) for i in range(5)], "sdr islamabad", counted_query="sdr islamabad")
+    # A background refresh: stores jobs, doesn't count as a search
+    again = await db.store_jobs([job(i) for i in range(3)] + [job(9, description="edited")], "sdr islamabad")
+    print(f"store_jobs: {stored} new, then {again} new ({len(TABLES['jobs'])} rows)")
+    assert stored == 5 and again == 1
+    # Resume mode with no generated query: the email must never reach /jobs/stats
+    await db.store_jobs([job(10)], "a@b.com", counted_query="a@b.com")
+    searches = [(d["key"], d["count"]) for d in ROLLUP_BUMPS if d["dimension"] == "query"]
+    assert searches == [("sdr islamabad", 1)], searches
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(db.get_recent_jobs(3) for _ in range(200)))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"200 concurrent get_recent_jobs: {elapsed:.0f} ms over {len(CLIENT_PORTS)} pooled connections")
+    assert all(len(r) == 3 for r in results)
+    assert len(CLIENT_PORTS) <= 20 + 1
+
+    await db.aclose()
+    print("[SUCCESS] async PostgREST layer OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+UI fetcher check against a local HTTP fixture (no network).
+
+Covers: ETag revalidation (304 -> cached parse), the download byte cap,
+and that a slow page doesn't block a fast one fetched concurrently.
+
+    python test_ui_fetcher.py
+"""
+
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ui_fetcher import PageFetcher
+
+PAGE = b"""<html><head><title>Bag</title><style>.bag{color:maroon}</style></head>
+<body><div class="bag">Flying bag</div></body></html>"""
+ETAG = '"v1"'
+HITS = {"full": 0, "not_modified": 0}
+
+
+class Fixture(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1.0)
+        if self.path == "/huge":
+            body = b"<html><body>" + b"<p>x</p>" * 200_000 + b"</body></html>"
+            return self._send(200, body)
+        if self.path == "/page" and self.headers.get("If-None-Match") == ETAG:
+            HITS["not_modified"] += 1
+            return self._send(304, b"")
+        HITS["full"] += 1
+        self._send(200, PAGE, {"ETag": ETAG} if self.path == "/page" else {})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client hit its byte cap and hung up
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Fixture)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+async def main():
+    base = start_fixture()
+    fetcher = PageFetcher(max_bytes=64 * 1024)
+
+    first = await fetcher.fetch(f"{base}/page")
+    second = await fetcher.fetch(f"{base}/page")
+    print(f"first:  cache={first['cache']:<12} title={first['title']} styles={first['styles_found']}")
+    print(f"second: cache={second['cache']:<12} server hits full={HITS['full']} 304={HITS['not_modified']}")
+    assert first["cache"] == "miss" and second["cache"] == "revalidated"
+    assert second["html_structure"] == first["html_structure"]
+
+    huge = await fetcher.fetch(f"{base}/huge")
+    print(f"huge:   truncated={huge['truncated']} kept={len(huge['html_structure'])} chars")
+    assert huge["truncated"]
+
+    start = time.perf_counter()
+    slow = asyncio.create_task(fetcher.fetch(f"{base}/slow"))
+    await asyncio.sleep(0.05)
+    fast_start = time.perf_counter()
+    await fetcher.fetch(f"{base}/other")
+    fast_ms = (time.perf_counter() - fast_start) * 1000
+    await slow
+    print(f"fast page while slow one in flight: {fast_ms:.0f} ms (slow total {time.perf_counter() - start:.2f}s)")
+    assert fast_ms < 500
+
+    await fetcher.aclose()
+    print("[SUCCESS] ui_fetcher OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
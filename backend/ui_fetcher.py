@@ -0,0 +1,117 @@
+"""Async, size-capped, conditionally cached page fetching for generic_ui_mcp"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+MAX_BYTES = 512 * 1024  # stop downloading after this; we keep 5000 chars anyway
+HTML_CHARS = 5000
+MAX_STYLES = 5
+CACHE_SIZE = 128
+
+
+def parse_page(html: bytes, encoding: str, url: str) -> Dict[str, Any]:
+    """CPU-bound: runs in a worker thread, never on the event loop"""
+    soup = BeautifulSoup(html, HTML_PARSER, from_encoding=encoding)
+    body = soup.find("body")
+    if not body:
+        return {"error": "No body tag found"}
+    styles = [s.text for s in soup.find_all("style")]
+    return {
+        "url": url,
+        "title": soup.title.string if soup.title else "No Title",
+        "html_structure": str(body)[:HTML_CHARS],  # Limit to 5000 chars for context
+        "styles_found": len(styles),
+        "inline_styles": styles[:MAX_STYLES]  # First 5 style tags
+    }
+
+
+@dataclass
+class _CacheEntry:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    result: Dict[str, Any]
+
+
+class PageFetcher:
+    """
+    One pooled httpx.AsyncClient shared by all tool calls.
+
+    Bodies are streamed and cut off at `max_bytes`. Responses carrying an
+    ETag or Last-Modified are cached (LRU) and revalidated with
+    If-None-Match / If-Modified-Since; a 304 returns the cached parse.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, timeout: float = 10.0, cache_size: int = CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"User-Agent": "Mozilla/5.0 (compatible; GenericUIScraper/1.0)"}
+            )
+        return self._client
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        cached = self._cache.get(url)
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                self._cache.move_to_end(url)
+                return {**cached.result, "cache": "revalidated"}
+            response.raise_for_status()
+
+            body = bytearray()
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    truncated = True
+                    break
+            encoding = response.encoding or "utf-8"
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+
+        result = await asyncio.to_thread(parse_page, bytes(body[:self.max_bytes]), encoding, url)
+        result["truncated"] = truncated
+        result["cache"] = "miss"
+
+        if (etag or last_modified) and "error" not in result:
+            self._cache[url] = _CacheEntry(etag, last_modified, result)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton
+page_fetcher = PageFetcher()